@@ -0,0 +1,30 @@
+from decimal import Decimal
+
+import orjson
+from bson import ObjectId
+from rest_framework.renderers import BaseRenderer
+
+
+def _default(obj):
+    """Handle the few types orjson doesn't serialize natively"""
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+class ORJSONRenderer(BaseRenderer):
+    """JSON renderer backed by orjson instead of the stdlib json module"""
+    media_type = 'application/json'
+    format = 'json'
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return orjson.dumps(
+            data,
+            default=_default,
+            option=orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY
+        )
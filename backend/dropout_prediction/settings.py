@@ -129,6 +129,20 @@ DATABASES = {
     }
 }
 
+# Optional PostgreSQL, reached through PgBouncer in transaction pooling mode
+if config('POSTGRES_DB', default=''):
+    DATABASES['default'] = {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': config('POSTGRES_DB'),
+        'USER': config('POSTGRES_USER', default='postgres'),
+        'PASSWORD': config('POSTGRES_PASSWORD', default=''),
+        'HOST': config('POSTGRES_HOST', default='pgbouncer'),
+        'PORT': config('POSTGRES_PORT', default='6432'),
+        'CONN_MAX_AGE': 0,  # PgBouncer keeps the server connections open
+        'CONN_HEALTH_CHECKS': True,
+        'DISABLE_SERVER_SIDE_CURSORS': True,  # Not supported with transaction pooling
+    }
+
 # Alternative MongoDB configuration (commented out for now)
 # DATABASES = {
 #     'default': {
@@ -198,7 +212,7 @@ REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'dropout_prediction.renderers.ORJSONRenderer',
     ],
 }
 
@@ -218,6 +232,15 @@ CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
 
+# Cache (shares the Redis instance used by Celery)
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': config('REDIS_URL', default='redis://localhost:6379/0'),
+    }
+}
+STUDENT_LIST_CACHE_TIMEOUT = config('STUDENT_LIST_CACHE_TIMEOUT', default=60, cast=int)
+
 # Email Configuration
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
 EMAIL_HOST = config('EMAIL_HOST', default='smtp.gmail.com')
@@ -235,6 +258,7 @@ TWILIO_PHONE_NUMBER = config('TWILIO_PHONE_NUMBER', default='')
 # ML Model Configuration
 ML_MODEL_PATH = os.path.join(BASE_DIR, '../ml-models/models/')
 ML_DATA_PATH = os.path.join(BASE_DIR, '../ml-models/data/')
+ML_WARM_ON_STARTUP = config('ML_WARM_ON_STARTUP', default=False, cast=bool)  # Preload models in each worker
 
 # Risk Threshold Configuration
 RISK_THRESHOLDS = {
@@ -252,6 +276,10 @@ RISK_THRESHOLDS = {
     },
     'FEES': {
         'OVERDUE_DAYS': 30,  # 30 days overdue
+    },
+    'RISK_SCORE': {
+        'HIGH_RISK': 60,  # Predicted risk score of 60 or more
+        'MEDIUM_RISK': 30,  # Between 30-60
     }
 }
 
@@ -16,7 +16,7 @@ import warnings
 warnings.filterwarnings('ignore')
 
 try:
-    from students.models_mongo import Student, Department, Batch, Attendance
+    from students.models_mongo import Student, Department, Batch, Attendance, ref_id, resolve_batches
     MONGODB_AVAILABLE = True
 except ImportError:
     MONGODB_AVAILABLE = False
@@ -244,8 +244,66 @@ class DropoutPredictionML:
                 'message': 'Error training models'
             }
     
-    def predict_dropout_risk(self, student_data, model_name='random_forest'):
-        """Predict dropout risk for a single student"""
+    @staticmethod
+    def student_features(student, department_code=None):
+        """Extract the raw fields featurize() needs from a Student document"""
+        if department_code is None:
+            department_code = student.batch.department.code
+        return {
+            'current_semester': student.current_semester,
+            'cgpa': student.cgpa,
+            'attendance_percentage': student.attendance_percentage,
+            'family_income': student.family_income,
+            'distance_from_home': student.distance_from_home,
+            'is_hosteler': student.is_hosteler,
+            'gender': student.gender,
+            'department': department_code,
+            'date_of_birth': student.date_of_birth,
+            'paid_amount': student.paid_amount,
+            'total_fee_amount': student.total_fee_amount
+        }
+    
+    def featurize(self, students):
+        """Build an (N, F) float32 feature matrix from a list of raw student dicts"""
+        n = len(students)
+        
+        # Age from date of birth, defaulting to 20 when unknown
+        today_ord = date.today().toordinal()
+        dob_ord = np.asarray(
+            [s['date_of_birth'].toordinal() if s.get('date_of_birth') else 0 for s in students],
+            dtype=np.float64
+        )
+        age = np.where(dob_ord > 0, (today_ord - dob_ord) / 365.25, 20)
+        
+        # Fee payment ratio, assuming fully paid if no fee amount
+        total_fee = np.asarray([s.get('total_fee_amount') or 0 for s in students], dtype=np.float64)
+        paid = np.asarray([s.get('paid_amount') or 0 for s in students], dtype=np.float64)
+        fee_payment_ratio = np.divide(paid, total_fee, out=np.ones(n), where=total_fee > 0)
+        
+        columns = {
+            'current_semester': [s['current_semester'] for s in students],
+            'cgpa': [s['cgpa'] for s in students],
+            'attendance_percentage': [s['attendance_percentage'] for s in students],
+            'family_income': [s.get('family_income') or 500000 for s in students],
+            'distance_from_home': [s.get('distance_from_home') or 50 for s in students],
+            'is_hosteler_encoded': [bool(s.get('is_hosteler')) for s in students],
+            'gender_encoded': self.label_encoders['gender_encoder'].transform(
+                [s['gender'] for s in students]
+            ),
+            'department_encoded': self.label_encoders['department_encoder'].transform(
+                [s['department'] for s in students]
+            ),
+            'age': age,
+            'fee_payment_ratio': fee_payment_ratio
+        }
+        
+        X = np.empty((n, len(self.feature_columns)), dtype=np.float32)
+        for idx, column in enumerate(self.feature_columns):
+            X[:, idx] = columns[column]
+        return X
+    
+    def predict_many(self, students, model_name='random_forest'):
+        """Predict dropout risk for a list of raw student dicts in one model call"""
         try:
             if not self.is_trained:
                 self.load_models()
@@ -253,78 +311,64 @@ class DropoutPredictionML:
             if model_name not in self.models:
                 raise ValueError(f"Model {model_name} not available")
             
-            # Prepare features
-            features = []
-            for column in self.feature_columns:
-                if column == 'gender_encoded':
-                    features.append(self.label_encoders['gender_encoder'].transform([student_data['gender']])[0])
-                elif column == 'department_encoded':
-                    features.append(self.label_encoders['department_encoder'].transform([student_data['department']])[0])
-                elif column == 'is_hosteler_encoded':
-                    features.append(int(student_data['is_hosteler']))
-                else:
-                    features.append(student_data[column.replace('_encoded', '')])
-            
-            X = np.array(features).reshape(1, -1)
+            X = self.featurize(students)
             
             # Scale if needed
             if model_name in ['logistic_regression']:
                 X = self.scalers[model_name].transform(X)
             
-            # Predict
             model = self.models[model_name]
-            prediction = model.predict(X)[0]
-            probability = model.predict_proba(X)[0]
-            
-            return {
-                'prediction': int(prediction),
-                'probability_low_risk': round(probability[0], 4),
-                'probability_high_risk': round(probability[1], 4),
-                'risk_level': 'high' if prediction == 1 else 'low',
-                'confidence': round(max(probability), 4),
-                'model_used': model_name
-            }
+            probabilities = model.predict_proba(X)
+            labels = model.classes_[probabilities.argmax(axis=1)]
+            
+            return [
+                {
+                    'prediction': int(label),
+                    'probability_low_risk': round(float(probability[0]), 4),
+                    'probability_high_risk': round(float(probability[1]), 4),
+                    'risk_level': 'high' if label == 1 else 'low',
+                    'confidence': round(float(probability.max()), 4),
+                    'model_used': model_name
+                }
+                for label, probability in zip(labels, probabilities)
+            ]
             
         except Exception as e:
-            return {
-                'error': str(e),
-                'prediction': None
-            }
+            return [{'error': str(e), 'prediction': None} for _ in students]
     
-    def bulk_predict(self, student_ids=None, model_name='random_forest'):
+    def predict_dropout_risk(self, student_data, model_name='random_forest'):
+        """Predict dropout risk for a single raw student dict (see student_features)"""
+        return self.predict_many([student_data], model_name)[0]
+    
+    def bulk_predict(self, student_ids=None, model_name='random_forest', limit=50):
         """Predict dropout risk for multiple students"""
         try:
             if not MONGODB_AVAILABLE:
                 raise Exception("MongoDB not available")
             
+            students = Student.objects.no_dereference().only(
+                'student_id', 'first_name', 'last_name', 'current_semester', 'cgpa',
+                'attendance_percentage', 'family_income', 'distance_from_home', 'is_hosteler',
+                'gender', 'batch', 'date_of_birth', 'paid_amount', 'total_fee_amount'
+            )
             if student_ids:
-                students = [Student.objects.get(student_id=sid) for sid in student_ids]
+                students = list(students.filter(student_id__in=student_ids))
             else:
-                students = list(Student.objects.all()[:50])  # Limit to 50 for performance
-            
-            predictions = []
-            for student in students:
-                # Prepare student data
-                age = (date.today() - student.date_of_birth).days / 365.25 if student.date_of_birth else 20
-                fee_payment_ratio = (student.paid_amount / student.total_fee_amount) if student.total_fee_amount > 0 else 1.0
-                
-                student_data = {
-                    'current_semester': student.current_semester,
-                    'cgpa': student.cgpa,
-                    'attendance_percentage': student.attendance_percentage,
-                    'family_income': student.family_income or 500000,
-                    'distance_from_home': student.distance_from_home or 50,
-                    'is_hosteler': student.is_hosteler,
-                    'gender': student.gender,
-                    'department': student.batch.department.code,
-                    'age': age,
-                    'fee_payment_ratio': fee_payment_ratio
-                }
-                
-                prediction = self.predict_dropout_risk(student_data, model_name)
+                # Let MongoDB pick the riskiest students via the current_risk_score index
+                students = list(students.order_by('-current_risk_score').limit(limit).batch_size(limit))
+            
+            # Resolve batch -> department codes in bulk instead of per student
+            batch_info = resolve_batches({ref_id(student.batch) for student in students})
+            predictions = self.predict_many(
+                [
+                    self.student_features(student, batch_info[ref_id(student.batch)][1].code)
+                    for student in students
+                ],
+                model_name
+            )
+            for student, prediction in zip(students, predictions):
                 prediction['student_id'] = student.student_id
                 prediction['student_name'] = f"{student.first_name} {student.last_name}"
-                predictions.append(prediction)
             
             return {
                 'success': True,
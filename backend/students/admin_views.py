@@ -19,6 +19,10 @@ def admin_dashboard_stats(request):
     try:
         if MONGODB_AVAILABLE:
             # MongoDB queries
+            risk_counts = {
+                row['_id']: row['n']
+                for row in Student._get_collection().aggregate([{'$group': {'_id': '$risk_category', 'n': {'$sum': 1}}}])
+            }
             stats = {
                 'database_info': {
                     'type': 'MongoDB',
@@ -27,12 +31,12 @@ def admin_dashboard_stats(request):
                     'database': 'dropout_prediction_db'
                 },
                 'student_stats': {
-                    'total_students': Student.objects.count(),
+                    'total_students': Student._get_collection().estimated_document_count(),
                     'active_students': Student.objects.filter(is_active=True).count(),
                     'inactive_students': Student.objects.filter(is_active=False).count(),
-                    'high_risk_students': Student.objects.filter(risk_category='high').count(),
-                    'medium_risk_students': Student.objects.filter(risk_category='medium').count(),
-                    'low_risk_students': Student.objects.filter(risk_category='low').count(),
+                    'high_risk_students': risk_counts.get('high', 0),
+                    'medium_risk_students': risk_counts.get('medium', 0),
+                    'low_risk_students': risk_counts.get('low', 0),
                 },
                 'academic_stats': {
                     'total_departments': Department.objects.count(),
@@ -314,14 +318,15 @@ def admin_system_health(request):
         
         if MONGODB_AVAILABLE:
             # Get collection stats
+            # Unfiltered totals come from collection metadata rather than a count scan
             health_info['collections'] = {
-                'students': Student.objects.count(),
-                'departments': Department.objects.count(),
-                'batches': Batch.objects.count(),
-                'attendance': Attendance.objects.count(),
-                'backlogs': StudentBacklog.objects.count(),
-                'mentors': StudentMentor.objects.count(),
-                'notes': StudentNote.objects.count()
+                'students': Student._get_collection().estimated_document_count(),
+                'departments': Department._get_collection().estimated_document_count(),
+                'batches': Batch._get_collection().estimated_document_count(),
+                'attendance': Attendance._get_collection().estimated_document_count(),
+                'backlogs': StudentBacklog._get_collection().estimated_document_count(),
+                'mentors': StudentMentor._get_collection().estimated_document_count(),
+                'notes': StudentNote._get_collection().estimated_document_count()
             }
         
         return Response({
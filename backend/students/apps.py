@@ -1,7 +1,17 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class StudentsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'students'
-    verbose_name = 'Student Management'
\ No newline at end of file
+    verbose_name = 'Student Management'
+
+    def ready(self):
+        # Load the trained ML models once per worker so the first request isn't cold
+        if getattr(settings, 'ML_WARM_ON_STARTUP', False):
+            try:
+                from .ml_views import _predictor
+                _predictor()
+            except ImportError:
+                pass
@@ -0,0 +1,78 @@
+import uuid
+from datetime import datetime, timedelta
+from django.core.cache import cache
+from mongoengine import signals
+
+from .models_mongo import Student
+
+# Single materialized document holding the dashboard headline numbers. It is
+# dropped whenever a student changes and rebuilt on the next read, so polling
+# dashboards read one small document instead of aggregating the collection.
+SUMMARY_COLLECTION = 'dashboard_summary'
+SUMMARY_ID = 'global'
+# The recent-enrollments window moves even without writes
+SUMMARY_MAX_AGE = timedelta(hours=1)
+_THIRTY_DAYS = timedelta(days=30)
+
+# Short-lived dashboard payloads cached by simple_views
+DASHBOARD_CACHE_KEY = 'dash:stats:v1'
+ANALYTICS_CACHE_KEY = 'dash:analytics:v1'
+# Replaced on every student write so cached student list pages stop matching
+STUDENT_LIST_VERSION_KEY = 'students:list:version'
+
+
+def _summary_collection():
+    return Student._get_db()[SUMMARY_COLLECTION]
+
+
+def refresh_dashboard_summary():
+    """Recompute the totals with one $group and store them as the summary document"""
+    now = datetime.utcnow()
+    thirty_days_ago = now - _THIRTY_DAYS
+
+    summary = next(Student.objects.aggregate([
+        {'$group': {
+            '_id': None,
+            'total': {'$sum': 1},
+            'high': {'$sum': {'$cond': [{'$eq': ['$risk_category', 'high']}, 1, 0]}},
+            'medium': {'$sum': {'$cond': [{'$eq': ['$risk_category', 'medium']}, 1, 0]}},
+            'low': {'$sum': {'$cond': [{'$eq': ['$risk_category', 'low']}, 1, 0]}},
+            'active': {'$sum': {'$cond': [{'$eq': ['$is_active', True]}, 1, 0]}},
+            'recent': {'$sum': {'$cond': [{'$gte': ['$enrollment_date', thirty_days_ago]}, 1, 0]}},
+            'avg_cgpa': {'$avg': '$cgpa'},
+            'avg_attendance': {'$avg': '$attendance_percentage'}
+        }}
+    ]), {})
+    summary.update({'_id': SUMMARY_ID, 'computed_at': now})
+
+    _summary_collection().replace_one({'_id': SUMMARY_ID}, summary, upsert=True)
+    return summary
+
+
+def dashboard_summary():
+    """Return the stored summary, rebuilding it when missing or too old"""
+    summary = _summary_collection().find_one({'_id': SUMMARY_ID})
+    if summary is None or summary['computed_at'] < datetime.utcnow() - SUMMARY_MAX_AGE:
+        summary = refresh_dashboard_summary()
+    return summary
+
+
+def invalidate_dashboard_summary():
+    """Drop the summary and cached dashboard/student list payloads so the next read rebuilds them.
+
+    Bulk writes (insert_many, bulk_write) skip document signals and must call
+    this themselves.
+    """
+    _summary_collection().delete_one({'_id': SUMMARY_ID})
+    cache.delete_many([DASHBOARD_CACHE_KEY, ANALYTICS_CACHE_KEY])
+    cache.set(STUDENT_LIST_VERSION_KEY, uuid.uuid4().hex, None)
+
+
+# The only Student receiver: every post_delete receiver makes QuerySet.delete()
+# fall back to deleting one document at a time
+def _student_changed(sender, document, **kwargs):
+    invalidate_dashboard_summary()
+
+
+signals.post_save.connect(_student_changed, sender=Student)
+signals.post_delete.connect(_student_changed, sender=Student)
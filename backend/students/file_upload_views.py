@@ -2,7 +2,11 @@ from rest_framework.decorators import api_view, parser_classes
 from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework.response import Response
 from rest_framework import status
+from django.http import StreamingHttpResponse
+from django.db import transaction
+from django.db.models import Q
 import pandas as pd
+import csv
 import io
 from datetime import datetime, date
 import re
@@ -14,10 +18,14 @@ logger = logging.getLogger(__name__)
 
 try:
     from .models_mongo import Department, Batch, Student
+    from .dashboard_summary import invalidate_dashboard_summary
+    from mongoengine.errors import ValidationError
+    from pymongo.errors import BulkWriteError
     MONGODB_AVAILABLE = True
 except ImportError:
     MONGODB_AVAILABLE = False
     from .models import Department, Batch, Student
+    from django.core.exceptions import ValidationError
 
 
 @api_view(['POST'])
@@ -32,7 +40,7 @@ def upload_students_file(request):
     - last_name (required)
     - email (required)
     - phone
-    - date_of_birth (YYYY-MM-DD or DD/MM/YYYY)
+    - date_of_birth (required, YYYY-MM-DD or DD/MM/YYYY)
     - gender (M/F)
     - batch_name (required)
     - department_code (required)
@@ -123,6 +131,29 @@ def process_student_data(df):
     departments_cache = {}
     batches_cache = {}
     
+    # Look up already-imported students and emails in one query instead of one per row
+    student_ids = [str(value).strip() for value in df['student_id']]
+    emails = [str(value).strip() for value in df['email']]
+    if MONGODB_AVAILABLE:
+        existing = Student.objects(
+            __raw__={'$or': [{'student_id': {'$in': student_ids}}, {'email': {'$in': emails}}]}
+        ).scalar('student_id', 'email')
+    else:
+        existing = Student.objects.filter(
+            Q(student_id__in=student_ids) | Q(email__in=emails)
+        ).values_list('student_id', 'email')
+    existing_ids = set()
+    existing_emails = set()
+    for existing_id, existing_email in existing:
+        existing_ids.add(existing_id)
+        existing_emails.add(existing_email)
+    
+    # Each student is validated against its model as it is built, so the new
+    # students can be inserted together at the end
+    new_students = []
+    new_summaries = []
+    new_rows = []
+    
     for index, row in df.iterrows():
         try:
             # Validate and process each row
@@ -195,19 +226,15 @@ def process_student_data(df):
             # Check if student already exists
             student_id = student_data['student_id']
             
-            if MONGODB_AVAILABLE:
-                try:
-                    existing_student = Student.objects.get(student_id=student_id)
-                    results['errors'].append(f"Row {index + 2}: Student {student_id} already exists")
-                    results['skipped_records'] += 1
-                    continue
-                except Student.DoesNotExist:
-                    pass
-            else:
-                if Student.objects.filter(student_id=student_id).exists():
-                    results['errors'].append(f"Row {index + 2}: Student {student_id} already exists")
-                    results['skipped_records'] += 1
-                    continue
+            if student_id in existing_ids:
+                results['errors'].append(f"Row {index + 2}: Student {student_id} already exists")
+                results['skipped_records'] += 1
+                continue
+            
+            if student_data['email'] in existing_emails:
+                results['errors'].append(f"Row {index + 2}: Email {student_data['email']} already exists")
+                results['skipped_records'] += 1
+                continue
             
             # Calculate risk score
             risk_score = calculate_risk_score(student_data)
@@ -234,10 +261,22 @@ def process_student_data(df):
                 is_active=True,
                 enrollment_date=student_data.get('enrollment_date', date.today()),
             )
-            student.save()
             
-            results['successful_imports'] += 1
-            results['student_summery'].append({
+            try:
+                if MONGODB_AVAILABLE:
+                    student.validate()
+                else:
+                    student.full_clean(validate_unique=False)
+            except ValidationError as e:
+                results['errors'].append(f"Row {index + 2}: Invalid student record - {str(e)}")
+                results['skipped_records'] += 1
+                continue
+            
+            existing_ids.add(student_id)
+            existing_emails.add(student_data['email'])
+            new_students.append(student)
+            new_rows.append(index + 2)
+            new_summaries.append({
                 'student_id': student_id,
                 'name': f"{student_data['first_name']} {student_data['last_name']}",
                 'risk_category': risk_category,
@@ -250,6 +289,37 @@ def process_student_data(df):
             results['skipped_records'] += 1
             logger.error(error_msg)
     
+    if new_students:
+        try:
+            failed = set()
+            if MONGODB_AVAILABLE:
+                try:
+                    Student._get_collection().insert_many(
+                        [student.to_mongo() for student in new_students], ordered=False
+                    )
+                except BulkWriteError as e:
+                    # The insert is unordered, so every row except the failed ones was written
+                    for write_error in e.details.get('writeErrors', []):
+                        failed.add(write_error['index'])
+                        error_msg = f"Row {new_rows[write_error['index']]}: Error saving record - {write_error.get('errmsg', '')}"
+                        results['errors'].append(error_msg)
+                        logger.error(error_msg)
+                invalidate_dashboard_summary()
+            else:
+                # All batches commit together so a failure leaves nothing half-imported
+                with transaction.atomic():
+                    Student.objects.bulk_create(new_students, batch_size=1000)
+            results['successful_imports'] = len(new_students) - len(failed)
+            results['skipped_records'] += len(failed)
+            results['student_summery'] = [
+                summary for i, summary in enumerate(new_summaries) if i not in failed
+            ]
+        except Exception as e:
+            error_msg = f"Error saving imported students - {str(e)}"
+            results['errors'].append(error_msg)
+            results['skipped_records'] += len(new_students)
+            logger.error(error_msg)
+    
     return results
 
 
@@ -341,6 +411,8 @@ def validate_and_clean_row(row, row_number):
                 
         except Exception:
             errors.append(f"Row {row_number}: Error parsing date_of_birth")
+    else:
+        errors.append(f"Row {row_number}: Missing required field 'date_of_birth'")
     
     # Boolean field processing
     hosteler_value = row.get('is_hosteler', '')
@@ -502,4 +574,41 @@ def download_sample_template(request):
         return Response({
             'error': 'Error generating template',
             'details': str(e)
-        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+EXPORT_FIELDS = [
+    'student_id', 'first_name', 'last_name', 'email', 'phone', 'current_semester',
+    'cgpa', 'attendance_percentage', 'current_risk_score', 'risk_category', 'fee_status'
+]
+EXPORT_CHUNK_SIZE = 2000
+
+
+class _Echo:
+    """Pseudo-buffer that hands each CSV row straight back to the caller"""
+    
+    def write(self, value):
+        return value
+
+
+@api_view(['GET'])
+def export_students_csv(request):
+    """Stream all students as CSV, fetching rows in chunks instead of loading the whole table"""
+    
+    if MONGODB_AVAILABLE:
+        students = Student.objects.no_dereference().only(*EXPORT_FIELDS).batch_size(EXPORT_CHUNK_SIZE)
+    else:
+        students = Student.objects.only(*EXPORT_FIELDS).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    
+    writer = csv.writer(_Echo())
+    
+    def rows():
+        yield writer.writerow(EXPORT_FIELDS)
+        for student in students:
+            yield writer.writerow([getattr(student, field) for field in EXPORT_FIELDS])
+    
+    response = StreamingHttpResponse(rows(), content_type='text/csv')
+    response['Content-Disposition'] = (
+        f'attachment; filename="students_{datetime.now().strftime("%Y%m%d")}.csv"'
+    )
+    return response
@@ -1,8 +1,10 @@
+from django.conf import settings
 from django.core.management.base import BaseCommand
 from django.utils import timezone
 from datetime import datetime, date, timedelta
-import random
 import mongoengine
+import numpy as np
+from pymongo import WriteConcern
 
 class Command(BaseCommand):
     help = 'Test MongoDB connection and create sample data'
@@ -59,6 +61,7 @@ class Command(BaseCommand):
     def create_sample_data(self, num_students):
         """Create sample data in MongoDB"""
         from students.models_mongo import Department, Batch, Student, Attendance
+        from students.dashboard_summary import invalidate_dashboard_summary
         
         self.stdout.write(f"📝 Creating sample data with {num_students} students...")
         
@@ -107,41 +110,61 @@ class Command(BaseCommand):
         first_names = ['Aarav', 'Vivaan', 'Aditya', 'Ananya', 'Diya', 'Priya', 'Rohan', 'Aryan', 'Kiran', 'Neha']
         last_names = ['Sharma', 'Verma', 'Singh', 'Kumar', 'Gupta', 'Patel', 'Shah', 'Reddy', 'Rao', 'Nair']
 
+        # Draw all per-student random values up front instead of per iteration
+        rng = np.random.default_rng()
+        batch_idx = rng.integers(0, len(batches), num_students)
+        first_name_idx = rng.integers(0, len(first_names), num_students)
+        last_name_idx = rng.integers(0, len(last_names), num_students)
+        attendance = rng.uniform(60, 95, num_students)
+        cgpas = rng.uniform(5.5, 9.5, num_students)
+        extra_risk = rng.integers(0, 21, num_students)
+        phones = rng.integers(100000000, 1000000000, num_students)
+        birth_months = rng.integers(1, 13, num_students)
+        birth_days = rng.integers(1, 29, num_students)
+        genders = rng.choice(['M', 'F'], num_students)
+        semesters = rng.integers(1, 9, num_students)
+        family_incomes = rng.integers(300000, 1500001, num_students)
+        distances = rng.integers(10, 201, num_students)
+        hostelers = rng.integers(0, 2, num_students).astype(bool)
+        enrollment_days = rng.integers(1, 16, num_students)
+
+        # Score and bucket every student in one vectorized pass
+        risk_scores = (
+            np.where(attendance < 75, 30, 0)
+            + np.where(cgpas < 6.5, 25, 0)
+            + extra_risk
+        )
+        thresholds = settings.RISK_THRESHOLDS['RISK_SCORE']
+        risk_categories = np.select(
+            [risk_scores >= thresholds['HIGH_RISK'], risk_scores >= thresholds['MEDIUM_RISK']],
+            ['high', 'medium'],
+            default='low'
+        )
+
+        # Skip students that already exist with a single lookup
+        student_ids = [
+            f"{batches[b].year % 100:02d}{batches[b].department.code}{i+1:03d}"
+            for i, b in enumerate(batch_idx)
+        ]
+        existing_ids = set(Student.objects(student_id__in=student_ids).scalar('student_id'))
+
         # Create Students
+        docs = []
         for i in range(num_students):
-            batch = random.choice(batches)
-            first_name = random.choice(first_names)
-            last_name = random.choice(last_names)
+            student_id = student_ids[i]
+            if student_id in existing_ids:
+                continue  # Skip if already exists
             
-            student_id = f"{batch.year % 100:02d}{batch.department.code}{i+1:03d}"
+            batch = batches[batch_idx[i]]
+            first_name = first_names[first_name_idx[i]]
+            last_name = last_names[last_name_idx[i]]
             email = f"{first_name.lower()}.{last_name.lower()}{i+1}@college.edu"
             
-            # Check if student already exists
-            try:
-                existing_student = Student.objects.get(student_id=student_id)
-                continue  # Skip if already exists
-            except Student.DoesNotExist:
-                pass
-            
             # Generate academic data
-            attendance_percentage = random.uniform(60, 95)
-            cgpa = random.uniform(5.5, 9.5)
-            
-            # Calculate risk score
-            risk_score = 0
-            if attendance_percentage < 75:
-                risk_score += 30
-            if cgpa < 6.5:
-                risk_score += 25
-            risk_score += random.randint(0, 20)
-            
-            # Determine risk category
-            if risk_score >= 60:
-                risk_category = 'high'
-            elif risk_score >= 30:
-                risk_category = 'medium'
-            else:
-                risk_category = 'low'
+            attendance_percentage = float(attendance[i])
+            cgpa = float(cgpas[i])
+            risk_score = int(risk_scores[i])
+            risk_category = str(risk_categories[i])
             
             # Create student
             student = Student(
@@ -149,25 +172,32 @@ class Command(BaseCommand):
                 first_name=first_name,
                 last_name=last_name,
                 email=email,
-                phone=f"9{random.randint(100000000, 999999999)}",
-                date_of_birth=date(2002, random.randint(1, 12), random.randint(1, 28)),
-                gender=random.choice(['M', 'F']),
+                phone=f"9{phones[i]}",
+                date_of_birth=date(2002, int(birth_months[i]), int(birth_days[i])),
+                gender=str(genders[i]),
                 batch=batch,
-                current_semester=random.randint(1, 8),
+                current_semester=int(semesters[i]),
                 cgpa=round(cgpa, 2),
                 attendance_percentage=round(attendance_percentage, 2),
                 current_risk_score=round(risk_score, 2),
                 risk_category=risk_category,
-                family_income=random.randint(300000, 1500000),
-                distance_from_home=random.randint(10, 200),
-                is_hosteler=random.choice([True, False]),
+                family_income=int(family_incomes[i]),
+                distance_from_home=int(distances[i]),
+                is_hosteler=bool(hostelers[i]),
                 is_active=True,
-                enrollment_date=date(batch.year, 7, random.randint(1, 15)),
+                enrollment_date=date(batch.year, 7, int(enrollment_days[i])),
             )
-            student.save()
-            
-            if i % 10 == 0:
-                self.stdout.write(f"📝 Created {i+1} students...")
+            student.validate()
+            docs.append(student.to_mongo())
+
+        # Seed data needs no acknowledgement - fire one unordered bulk insert
+        if docs:
+            Student._get_collection().with_options(
+                write_concern=WriteConcern(w=0)
+            ).insert_many(docs, ordered=False)
+            # The unacknowledged insert fires no signals
+            invalidate_dashboard_summary()
+        self.stdout.write(f"📝 Created {len(docs)} students...")
 
         # Final counts
         total_departments = Department.objects.count()
@@ -0,0 +1,84 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from datetime import datetime
+from pymongo import UpdateOne
+
+from ml_models.dropout_prediction import ml_predictor
+from students.dashboard_summary import invalidate_dashboard_summary
+from students.models_mongo import Student, ref_id, resolve_batches
+
+
+class Command(BaseCommand):
+    help = 'Rescore every active student with the trained model and store the results'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--model',
+            default='random_forest',
+            help='Model to score with (default: random_forest)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Students scored and written per round trip (default: 1000)'
+        )
+
+    def handle(self, *args, **options):
+        model_name = options['model']
+        batch_size = options['batch_size']
+
+        students = Student.objects(is_active=True).no_dereference().only(
+            'id', 'current_semester', 'cgpa', 'attendance_percentage', 'family_income',
+            'distance_from_home', 'is_hosteler', 'gender', 'batch', 'date_of_birth',
+            'paid_amount', 'total_fee_amount'
+        ).batch_size(batch_size)
+
+        updated = 0
+        chunk = []
+        for student in students:
+            chunk.append(student)
+            if len(chunk) == batch_size:
+                updated += self._score(chunk, model_name)
+                chunk = []
+        if chunk:
+            updated += self._score(chunk, model_name)
+        invalidate_dashboard_summary()
+
+        self.stdout.write(self.style.SUCCESS(f"✅ Updated risk scores for {updated} students"))
+
+    def _score(self, students, model_name):
+        """Predict a chunk of students in one model call and write it back in one bulk_write"""
+        batch_info = resolve_batches({ref_id(student.batch) for student in students})
+        predictions = ml_predictor.predict_many(
+            [
+                ml_predictor.student_features(student, batch_info[ref_id(student.batch)][1].code)
+                for student in students
+            ],
+            model_name
+        )
+
+        now = datetime.utcnow()
+        thresholds = settings.RISK_THRESHOLDS['RISK_SCORE']
+        operations = []
+        for student, prediction in zip(students, predictions):
+            if prediction.get('prediction') is None:
+                continue
+            risk_score = round(prediction['probability_high_risk'] * 100, 2)
+            if risk_score >= thresholds['HIGH_RISK']:
+                risk_category = 'high'
+            elif risk_score >= thresholds['MEDIUM_RISK']:
+                risk_category = 'medium'
+            else:
+                risk_category = 'low'
+            operations.append(UpdateOne({'_id': student.id}, {'$set': {
+                'current_risk_score': risk_score,
+                'risk_category': risk_category,
+                'last_risk_update': now,
+                'updated_at': now
+            }}))
+
+        if not operations:
+            return 0
+        Student._get_collection().bulk_write(operations, ordered=False)
+        return len(operations)
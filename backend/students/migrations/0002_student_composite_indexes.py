@@ -0,0 +1,33 @@
+# Generated by Django 5.2.8 on 2026-10-15 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='student',
+            name='students_st_batch_i_c8b64c_idx',
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(fields=['batch', 'risk_category', '-current_risk_score'], name='stu_batch_risk_score_i'),
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(fields=['is_active', 'risk_category'], name='stu_active_risk_i'),
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(fields=['batch', 'current_semester'], name='stu_batch_sem_i'),
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(fields=['fee_status', '-current_risk_score'], name='stu_fee_risk_i'),
+        ),
+    ]
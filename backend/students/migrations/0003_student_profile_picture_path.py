@@ -0,0 +1,26 @@
+# Generated by Django 5.2.8 on 2026-10-15 10:30
+
+from django.db import migrations, models
+
+
+def clear_null_profile_pictures(apps, schema_editor):
+    # The old ImageField column already stores the file name; only NULLs need
+    # converting before the column becomes NOT NULL
+    Student = apps.get_model('students', 'Student')
+    Student.objects.filter(profile_picture__isnull=True).update(profile_picture='')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students', '0002_student_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(clear_null_profile_pictures, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='student',
+            name='profile_picture',
+            field=models.CharField(blank=True, max_length=500),
+        ),
+    ]
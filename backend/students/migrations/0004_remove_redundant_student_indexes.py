@@ -0,0 +1,21 @@
+# Generated by Django 5.2.8 on 2026-10-15 11:00
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students', '0003_student_profile_picture_path'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='student',
+            name='students_st_student_e7126a_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='student',
+            name='students_st_risk_ca_440bb3_idx',
+        ),
+    ]
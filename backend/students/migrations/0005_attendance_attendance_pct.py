@@ -0,0 +1,32 @@
+# Generated by Django 5.2.8 on 2026-10-15 11:30
+
+from django.db import migrations, models
+from django.db.models import Case, FloatField, Value, When
+from django.db.models.functions import Cast
+
+
+def populate_attendance_pct(apps, schema_editor):
+    Attendance = apps.get_model('students', 'Attendance')
+    Attendance.objects.update(
+        attendance_pct=Case(
+            When(classes_held=0, then=Value(0.0)),
+            default=Cast('classes_attended', FloatField()) * 100.0 / Cast('classes_held', FloatField()),
+            output_field=FloatField()
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students', '0004_remove_redundant_student_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='attendance',
+            name='attendance_pct',
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.RunPython(populate_attendance_pct, migrations.RunPython.noop),
+    ]
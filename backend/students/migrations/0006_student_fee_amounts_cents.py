@@ -0,0 +1,50 @@
+# Generated by Django 5.2.8 on 2026-10-15 11:45
+
+from django.db import migrations, models
+from django.db.models import BigIntegerField, F
+from django.db.models.functions import Cast, Round
+
+
+def amounts_to_cents(apps, schema_editor):
+    Student = apps.get_model('students', 'Student')
+    Student.objects.update(
+        total_fee_amount_cents=Cast(Round(F('total_fee_amount') * 100), BigIntegerField()),
+        paid_amount_cents=Cast(Round(F('paid_amount') * 100), BigIntegerField()),
+    )
+
+
+def cents_to_amounts(apps, schema_editor):
+    Student = apps.get_model('students', 'Student')
+    Student.objects.update(
+        total_fee_amount=F('total_fee_amount_cents') / 100.0,
+        paid_amount=F('paid_amount_cents') / 100.0,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students', '0005_attendance_attendance_pct'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='student',
+            name='total_fee_amount_cents',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='student',
+            name='paid_amount_cents',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.RunPython(amounts_to_cents, cents_to_amounts),
+        migrations.RemoveField(
+            model_name='student',
+            name='total_fee_amount',
+        ),
+        migrations.RemoveField(
+            model_name='student',
+            name='paid_amount',
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.8 on 2026-10-15 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students', '0006_student_fee_amounts_cents'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(condition=models.Q(('is_active', True), ('risk_category', 'high')), fields=['-current_risk_score'], name='stu_high_risk_active_i'),
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['student_id'], name='stu_active_i'),
+        ),
+    ]
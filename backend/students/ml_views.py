@@ -1,21 +1,44 @@
-from django.http import JsonResponse
+from django.http import HttpResponse, StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
-import json
+import numpy as np
+import orjson
+from functools import lru_cache
 from ml_models.dropout_prediction import ml_predictor
 from datetime import datetime
 
 
+def _json_response(data, status=200):
+    """Serialize with orjson, passing NumPy values straight through"""
+    return HttpResponse(
+        orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY),
+        status=status,
+        content_type='application/json'
+    )
+
+
+@lru_cache(maxsize=1)
+def _predictor():
+    """Return the process-wide predictor, loading the pickled models only once"""
+    if not ml_predictor.is_trained:
+        try:
+            ml_predictor.load_models()
+        except Exception:
+            # Models not trained yet - the predictor reports this on use
+            pass
+    return ml_predictor
+
+
 @csrf_exempt
 @require_http_methods(["POST"])
 def train_ml_models(request):
     """Train the ML models with current student data"""
     try:
         print("🚀 Starting ML model training...")
-        result = ml_predictor.train_models()
+        result = _predictor().train_models()
         
         if result['success']:
-            return JsonResponse({
+            return _json_response({
                 'success': True,
                 'message': 'ML models trained successfully',
                 'data': {
@@ -26,14 +49,14 @@ def train_ml_models(request):
                 }
             })
         else:
-            return JsonResponse({
+            return _json_response({
                 'success': False,
                 'message': result['message'],
                 'error': result['error']
             }, status=400)
             
     except Exception as e:
-        return JsonResponse({
+        return _json_response({
             'success': False,
             'message': 'Error training ML models',
             'error': str(e)
@@ -45,12 +68,12 @@ def train_ml_models(request):
 def predict_student_risk(request):
     """Predict dropout risk for a specific student"""
     try:
-        data = json.loads(request.body)
+        data = orjson.loads(request.body)
         student_id = data.get('student_id')
         model_name = data.get('model_name', 'random_forest')
         
         if not student_id:
-            return JsonResponse({
+            return _json_response({
                 'success': False,
                 'message': 'Student ID is required'
             }, status=400)
@@ -58,37 +81,26 @@ def predict_student_risk(request):
         # Get student data from MongoDB
         try:
             from students.models_mongo import Student
-            student = Student.objects.get(student_id=student_id)
+            student = Student.objects(student_id=student_id).only(
+                'current_semester', 'cgpa', 'attendance_percentage', 'family_income',
+                'distance_from_home', 'is_hosteler', 'gender', 'date_of_birth',
+                'paid_amount', 'total_fee_amount', 'batch', 'first_name', 'last_name'
+            ).first()
+            if student is None:
+                raise Student.DoesNotExist
             
-            # Prepare student data for prediction
-            from datetime import date
-            age = (date.today() - student.date_of_birth).days / 365.25 if student.date_of_birth else 20
-            fee_payment_ratio = (student.paid_amount / student.total_fee_amount) if student.total_fee_amount > 0 else 1.0
-            
-            student_data = {
-                'current_semester': student.current_semester,
-                'cgpa': student.cgpa,
-                'attendance_percentage': student.attendance_percentage,
-                'family_income': student.family_income or 500000,
-                'distance_from_home': student.distance_from_home or 50,
-                'is_hosteler': student.is_hosteler,
-                'gender': student.gender,
-                'department': student.batch.department.code,
-                'age': age,
-                'fee_payment_ratio': fee_payment_ratio
-            }
-            
-            # Get prediction
-            prediction = ml_predictor.predict_dropout_risk(student_data, model_name)
+            # Get prediction through the shared featurizer used by bulk prediction
+            predictor = _predictor()
+            prediction = predictor.predict_many([predictor.student_features(student)], model_name)[0]
             
             if 'error' in prediction:
-                return JsonResponse({
+                return _json_response({
                     'success': False,
                     'message': 'Error making prediction',
                     'error': prediction['error']
                 }, status=500)
             
-            return JsonResponse({
+            return _json_response({
                 'success': True,
                 'student_id': student_id,
                 'student_name': f"{student.first_name} {student.last_name}",
@@ -97,18 +109,18 @@ def predict_student_risk(request):
             })
             
         except Student.DoesNotExist:
-            return JsonResponse({
+            return _json_response({
                 'success': False,
                 'message': f'Student with ID {student_id} not found'
             }, status=404)
         
-    except json.JSONDecodeError:
-        return JsonResponse({
+    except orjson.JSONDecodeError:
+        return _json_response({
             'success': False,
             'message': 'Invalid JSON data'
         }, status=400)
     except Exception as e:
-        return JsonResponse({
+        return _json_response({
             'success': False,
             'message': 'Error predicting student risk',
             'error': str(e)
@@ -120,7 +132,7 @@ def predict_student_risk(request):
 def bulk_predict_risk(request):
     """Predict dropout risk for multiple students"""
     try:
-        data = json.loads(request.body)
+        data = orjson.loads(request.body)
         student_ids = data.get('student_ids', [])
         model_name = data.get('model_name', 'random_forest')
         limit = data.get('limit', 50)  # Default limit to prevent overload
@@ -129,34 +141,43 @@ def bulk_predict_risk(request):
         if not student_ids:
             student_ids = None
             
-        result = ml_predictor.bulk_predict(student_ids, model_name)
+        result = _predictor().bulk_predict(student_ids, model_name, limit)
         
         if result['success']:
             # Sort by risk level (high risk first)
             predictions = result['predictions']
             predictions.sort(key=lambda x: x.get('probability_high_risk', 0), reverse=True)
             
-            return JsonResponse({
-                'success': True,
-                'predictions': predictions[:limit],
+            # Stream row by row so the full JSON body is never buffered at once
+            trailer = orjson.dumps({
                 'total_analyzed': result['total_analyzed'],
                 'model_used': model_name,
                 'timestamp': datetime.now().isoformat()
             })
+            
+            def stream():
+                yield b'{"success":true,"predictions":['
+                for idx, prediction in enumerate(predictions[:limit]):
+                    if idx:
+                        yield b','
+                    yield orjson.dumps(prediction, option=orjson.OPT_SERIALIZE_NUMPY)
+                yield b'],' + trailer[1:]
+            
+            return StreamingHttpResponse(stream(), content_type='application/json')
         else:
-            return JsonResponse({
+            return _json_response({
                 'success': False,
                 'message': 'Error in bulk prediction',
                 'error': result['error']
             }, status=500)
             
-    except json.JSONDecodeError:
-        return JsonResponse({
+    except orjson.JSONDecodeError:
+        return _json_response({
             'success': False,
             'message': 'Invalid JSON data'
         }, status=400)
     except Exception as e:
-        return JsonResponse({
+        return _json_response({
             'success': False,
             'message': 'Error in bulk prediction',
             'error': str(e)
@@ -167,16 +188,16 @@ def bulk_predict_risk(request):
 def ml_model_info(request):
     """Get information about trained ML models"""
     try:
-        info = ml_predictor.get_model_info()
+        info = _predictor().get_model_info()
         
-        return JsonResponse({
+        return _json_response({
             'success': True,
             'model_info': info,
             'timestamp': datetime.now().isoformat()
         })
         
     except Exception as e:
-        return JsonResponse({
+        return _json_response({
             'success': False,
             'message': 'Error getting model information',
             'error': str(e)
@@ -190,83 +211,98 @@ def analytics_dashboard(request):
         from students.models_mongo import Student, Department
         
         # Basic statistics
-        total_students = Student.objects.count()
-        high_risk_students = Student.objects.filter(risk_category='high').count()
-        medium_risk_students = Student.objects.filter(risk_category='medium').count()
-        low_risk_students = Student.objects.filter(risk_category='low').count()
+        total_students = Student._get_collection().estimated_document_count()
+        risk_counts = {
+            row['_id']: row['n']
+            for row in Student._get_collection().aggregate([{'$group': {'_id': '$risk_category', 'n': {'$sum': 1}}}])
+        }
+        high_risk_students = risk_counts.get('high', 0)
+        medium_risk_students = risk_counts.get('medium', 0)
+        low_risk_students = risk_counts.get('low', 0)
         
-        # Department-wise analysis
-        departments = Department.objects.all()
+        # Department-wise analysis with server-side $avg instead of loading each department's students
+        from students.models_mongo import Batch
         dept_analysis = []
+        for row in Student._get_collection().aggregate([
+            {'$lookup': {
+                'from': Batch._get_collection_name(),
+                'localField': 'batch',
+                'foreignField': '_id',
+                'as': 'b'
+            }},
+            {'$unwind': '$b'},
+            {'$group': {
+                '_id': '$b.department',
+                'total': {'$sum': 1},
+                'high': {'$sum': {'$cond': [{'$eq': ['$risk_category', 'high']}, 1, 0]}},
+                'medium': {'$sum': {'$cond': [{'$eq': ['$risk_category', 'medium']}, 1, 0]}},
+                'low': {'$sum': {'$cond': [{'$eq': ['$risk_category', 'low']}, 1, 0]}},
+                'avg_cgpa': {'$avg': '$cgpa'},
+                'avg_attendance': {'$avg': '$attendance_percentage'}
+            }},
+            {'$lookup': {
+                'from': Department._get_collection_name(),
+                'localField': '_id',
+                'foreignField': '_id',
+                'as': 'd'
+            }},
+            {'$unwind': '$d'},
+            {'$sort': {'d.name': 1}}
+        ]):
+            dept_analysis.append({
+                'department': row['d']['name'],
+                'code': row['d']['code'],
+                'total_students': row['total'],
+                'high_risk': row['high'],
+                'medium_risk': row['medium'],
+                'low_risk': row['low'],
+                'high_risk_percentage': round((row['high'] / row['total']) * 100, 2),
+                'average_cgpa': round(row['avg_cgpa'] or 0, 2),
+                'average_attendance': round(row['avg_attendance'] or 0, 2)
+            })
         
-        for dept in departments:
-            # Get all batches for this department - MongoDB approach
-            from students.models_mongo import Batch
-            dept_batches = Batch.objects.filter(department=dept)
-            
-            # Get students in those batches
-            dept_students = Student.objects.filter(batch__in=dept_batches)
-            dept_total = dept_students.count()
-            
-            if dept_total > 0:
-                dept_high_risk = dept_students.filter(risk_category='high').count()
-                dept_medium_risk = dept_students.filter(risk_category='medium').count()
-                dept_low_risk = dept_students.filter(risk_category='low').count()
-                
-                # Calculate average metrics
-                dept_students_list = list(dept_students)
-                if dept_students_list:
-                    avg_cgpa = sum(s.cgpa for s in dept_students_list) / len(dept_students_list)
-                    avg_attendance = sum(s.attendance_percentage for s in dept_students_list) / len(dept_students_list)
-                else:
-                    avg_cgpa = 0
-                    avg_attendance = 0
-                
-                dept_analysis.append({
-                    'department': dept.name,
-                    'code': dept.code,
-                    'total_students': dept_total,
-                    'high_risk': dept_high_risk,
-                    'medium_risk': dept_medium_risk,
-                    'low_risk': dept_low_risk,
-                    'high_risk_percentage': round((dept_high_risk / dept_total) * 100, 2) if dept_total > 0 else 0,
-                    'average_cgpa': round(avg_cgpa, 2),
-                    'average_attendance': round(avg_attendance, 2)
-                })
-        
-        # Semester-wise analysis
+        # Semester-wise analysis in a single $group instead of two counts per semester
+        semester_counts = {
+            row['_id']: row for row in Student._get_collection().aggregate([
+                {'$match': {'current_semester': {'$gte': 1, '$lte': 8}}},
+                {'$group': {
+                    '_id': '$current_semester',
+                    'total': {'$sum': 1},
+                    'high': {'$sum': {'$cond': [{'$eq': ['$risk_category', 'high']}, 1, 0]}}
+                }}
+            ])
+        }
         semester_analysis = {}
         for semester in range(1, 9):
-            sem_students = Student.objects.filter(current_semester=semester)
-            sem_count = sem_students.count()
-            
-            if sem_count > 0:
-                sem_high_risk = sem_students.filter(risk_category='high').count()
+            row = semester_counts.get(semester)
+            if row:
                 semester_analysis[f'semester_{semester}'] = {
-                    'total': sem_count,
-                    'high_risk': sem_high_risk,
-                    'risk_percentage': round((sem_high_risk / sem_count) * 100, 2)
+                    'total': row['total'],
+                    'high_risk': row['high'],
+                    'risk_percentage': round((row['high'] / row['total']) * 100, 2)
                 }
         
-        # CGPA distribution
-        cgpa_ranges = {
-            '9.0-10.0': Student.objects.filter(cgpa__gte=9.0).count(),
-            '8.0-8.9': Student.objects.filter(cgpa__gte=8.0, cgpa__lt=9.0).count(),
-            '7.0-7.9': Student.objects.filter(cgpa__gte=7.0, cgpa__lt=8.0).count(),
-            '6.0-6.9': Student.objects.filter(cgpa__gte=6.0, cgpa__lt=7.0).count(),
-            'Below 6.0': Student.objects.filter(cgpa__lt=6.0).count()
-        }
+        # CGPA and attendance distributions: fetch just the two fields once
+        # and bucket them with np.histogram instead of ten count queries
+        docs = list(Student._get_collection().find({}, {'_id': 0, 'cgpa': 1, 'attendance_percentage': 1}))
+        cgpa = np.fromiter((d.get('cgpa', np.nan) for d in docs), dtype=np.float64, count=len(docs))
+        attendance = np.fromiter(
+            (d.get('attendance_percentage', np.nan) for d in docs), dtype=np.float64, count=len(docs)
+        )
+        cgpa_counts, _ = np.histogram(cgpa[~np.isnan(cgpa)], bins=[0, 6, 7, 8, 9, 10.01])
+        attendance_counts, _ = np.histogram(attendance[~np.isnan(attendance)], bins=[0, 60, 70, 80, 90, 100.01])
         
-        # Attendance distribution
-        attendance_ranges = {
-            '90-100%': Student.objects.filter(attendance_percentage__gte=90).count(),
-            '80-89%': Student.objects.filter(attendance_percentage__gte=80, attendance_percentage__lt=90).count(),
-            '70-79%': Student.objects.filter(attendance_percentage__gte=70, attendance_percentage__lt=80).count(),
-            '60-69%': Student.objects.filter(attendance_percentage__gte=60, attendance_percentage__lt=70).count(),
-            'Below 60%': Student.objects.filter(attendance_percentage__lt=60).count()
-        }
+        # Bins are in ascending order; the labels read from the top bucket down
+        cgpa_ranges = dict(zip(
+            ['9.0-10.0', '8.0-8.9', '7.0-7.9', '6.0-6.9', 'Below 6.0'],
+            cgpa_counts[::-1].tolist()
+        ))
+        attendance_ranges = dict(zip(
+            ['90-100%', '80-89%', '70-79%', '60-69%', 'Below 60%'],
+            attendance_counts[::-1].tolist()
+        ))
         
-        return JsonResponse({
+        return _json_response({
             'success': True,
             'analytics': {
                 'overview': {
@@ -285,7 +321,7 @@ def analytics_dashboard(request):
         })
         
     except Exception as e:
-        return JsonResponse({
+        return _json_response({
             'success': False,
             'message': 'Error getting analytics data',
             'error': str(e)
@@ -296,10 +332,10 @@ def analytics_dashboard(request):
 def feature_importance_analysis(request):
     """Get feature importance analysis from trained models"""
     try:
-        info = ml_predictor.get_model_info()
+        info = _predictor().get_model_info()
         
         if not info['is_trained']:
-            return JsonResponse({
+            return _json_response({
                 'success': False,
                 'message': 'ML models are not trained yet. Please train models first.'
             }, status=400)
@@ -328,7 +364,7 @@ def feature_importance_analysis(request):
         # Sort by average importance
         sorted_features = sorted(avg_importance.items(), key=lambda x: x[1], reverse=True)
         
-        return JsonResponse({
+        return _json_response({
             'success': True,
             'feature_analysis': {
                 'individual_model_importance': feature_importance,
@@ -341,7 +377,7 @@ def feature_importance_analysis(request):
         })
         
     except Exception as e:
-        return JsonResponse({
+        return _json_response({
             'success': False,
             'message': 'Error getting feature importance analysis',
             'error': str(e)
@@ -1,4 +1,6 @@
+from decimal import Decimal, ROUND_HALF_UP
 from django.db import models
+from django.db.models import Q
 from django.contrib.auth.models import User
 from django.core.validators import MinValueValidator, MaxValueValidator
 
@@ -79,8 +81,10 @@ class Student(models.Model):
         ],
         default='pending'
     )
-    total_fee_amount = models.DecimalField(max_digits=10, decimal_places=2, default=0)
-    paid_amount = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    # Money is stored as integer cents; total_fee_amount/paid_amount below
+    # expose it in rupees
+    total_fee_amount_cents = models.BigIntegerField(default=0)
+    paid_amount_cents = models.BigIntegerField(default=0)
     last_payment_date = models.DateField(null=True, blank=True)
     
     # Risk Assessment Fields
@@ -100,17 +104,29 @@ class Student(models.Model):
     last_risk_update = models.DateTimeField(auto_now=True)
     
     # Additional Fields
-    profile_picture = models.ImageField(upload_to='students/profiles/', blank=True, null=True)
+    profile_picture = models.CharField(max_length=500, blank=True)  # Store file path or URL
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         ordering = ['student_id']
+        # student_id is already indexed by unique=True, and the low-selectivity
+        # risk_category is only indexed as part of the composites below
         indexes = [
-            models.Index(fields=['student_id']),
-            models.Index(fields=['risk_category']),
             models.Index(fields=['current_risk_score']),
-            models.Index(fields=['batch']),
+            # Composite indexes for the dashboard filter + sort patterns; the
+            # (batch, ...) prefixes also cover batch-only lookups
+            models.Index(fields=['batch', 'risk_category', '-current_risk_score'], name='stu_batch_risk_score_i'),
+            models.Index(fields=['is_active', 'risk_category'], name='stu_active_risk_i'),
+            models.Index(fields=['batch', 'current_semester'], name='stu_batch_sem_i'),
+            models.Index(fields=['fee_status', '-current_risk_score'], name='stu_fee_risk_i'),
+            # Partial indexes for the dashboard slices; they only hold the
+            # matching rows (ignored by backends without partial index support)
+            models.Index(
+                fields=['-current_risk_score'], name='stu_high_risk_active_i',
+                condition=Q(is_active=True, risk_category='high')
+            ),
+            models.Index(fields=['student_id'], name='stu_active_i', condition=Q(is_active=True)),
         ]
     
     def __str__(self):
@@ -120,15 +136,52 @@ class Student(models.Model):
     def full_name(self):
         return f"{self.first_name} {self.last_name}"
     
+    @property
+    def total_fee_amount(self):
+        return self.total_fee_amount_cents / 100
+    
+    @total_fee_amount.setter
+    def total_fee_amount(self, value):
+        self.total_fee_amount_cents = int((Decimal(str(value)) * 100).quantize(Decimal('1'), ROUND_HALF_UP))
+        self._clear_fee_annotations()
+    
+    @property
+    def paid_amount(self):
+        return self.paid_amount_cents / 100
+    
+    @paid_amount.setter
+    def paid_amount(self, value):
+        self.paid_amount_cents = int((Decimal(str(value)) * 100).quantize(Decimal('1'), ROUND_HALF_UP))
+        self._clear_fee_annotations()
+    
+    def _clear_fee_annotations(self):
+        # Annotated values describe the row as loaded, not the amounts just set
+        self.__dict__.pop('_outstanding_fee', None)
+        self.__dict__.pop('_fee_payment_percentage', None)
+    
+    # The fee properties fall back to Python arithmetic when the queryset
+    # didn't annotate them (see StudentSerializer.setup_eager_loading)
     @property
     def outstanding_fee(self):
-        return self.total_fee_amount - self.paid_amount
+        if '_outstanding_fee' in self.__dict__:
+            return self._outstanding_fee
+        return (self.total_fee_amount_cents - self.paid_amount_cents) / 100
+    
+    @outstanding_fee.setter
+    def outstanding_fee(self, value):
+        self._outstanding_fee = value
     
     @property
     def fee_payment_percentage(self):
-        if self.total_fee_amount == 0:
+        if '_fee_payment_percentage' in self.__dict__:
+            return self._fee_payment_percentage
+        if self.total_fee_amount_cents == 0:
             return 100
-        return (self.paid_amount / self.total_fee_amount) * 100
+        return (self.paid_amount_cents / self.total_fee_amount_cents) * 100
+    
+    @fee_payment_percentage.setter
+    def fee_payment_percentage(self, value):
+        self._fee_payment_percentage = value
 
 
 class StudentBacklog(models.Model):
@@ -236,6 +289,7 @@ class Attendance(models.Model):
     year = models.IntegerField()
     classes_held = models.IntegerField(default=0)
     classes_attended = models.IntegerField(default=0)
+    attendance_pct = models.FloatField(default=0.0)  # Denormalized on save
     
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -244,11 +298,16 @@ class Attendance(models.Model):
         unique_together = ('student', 'month', 'year')
         ordering = ['-year', '-month']
     
+    def save(self, *args, **kwargs):
+        if self.classes_held == 0:
+            self.attendance_pct = 0.0
+        else:
+            self.attendance_pct = (self.classes_attended / self.classes_held) * 100
+        super().save(*args, **kwargs)
+    
     @property
     def attendance_percentage(self):
-        if self.classes_held == 0:
-            return 0
-        return (self.classes_attended / self.classes_held) * 100
+        return self.attendance_pct
     
     def __str__(self):
         return f"{self.student.student_id} - {self.month}/{self.year} ({self.attendance_percentage:.1f}%)"
\ No newline at end of file
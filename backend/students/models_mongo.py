@@ -1,3 +1,9 @@
+"""MongoEngine documents, the primary store for student data.
+
+Each view module picks one backend at import time (models_mongo, falling back
+to the Django models in models.py when MongoEngine is unavailable), so every
+write goes to exactly one database; nothing mirrors students between the two.
+"""
 from mongoengine import Document, EmbeddedDocument, fields
 from datetime import datetime, date
 from enum import Enum
@@ -42,6 +48,21 @@ class NoteTypeChoices(Enum):
     OTHER = 'other'
 
 
+def ref_id(value):
+    """Return the ObjectId behind a reference field value without dereferencing it"""
+    return getattr(value, 'id', value)
+
+
+def resolve_batches(batch_ids):
+    """Fetch batches and their departments in two queries, keyed by batch id"""
+    batches = list(Batch.objects(id__in=list(batch_ids)).no_dereference().only('name', 'year', 'department'))
+    department_ids = {ref_id(batch.department) for batch in batches}
+    departments = {
+        dept.id: dept for dept in Department.objects(id__in=list(department_ids)).only('name', 'code')
+    }
+    return {batch.id: (batch, departments.get(ref_id(batch.department))) for batch in batches}
+
+
 class Department(Document):
     """Department model for organizing students"""
     name = fields.StringField(max_length=100, required=True, unique=True)
@@ -144,11 +165,19 @@ class Student(Document):
         'indexes': [
             'student_id',
             'email',
-            'risk_category',
             'current_risk_score',
-            'batch',
-            ('batch', 'current_semester'),
-            'is_active'
+            ('batch', 'current_semester'),  # Also serves batch-only lookups
+            ('risk_category', 'batch'),
+            # student_list filter combinations; also serves risk_category-only lookups
+            ('risk_category', 'current_semester', 'batch'),
+            'current_semester',
+            'enrollment_date',
+            ('is_active', 'risk_category'),  # Also serves is_active-only lookups
+            # Text index for student search (no stemming for names and ids)
+            {
+                'fields': ['$first_name', '$last_name', '$student_id'],
+                'default_language': 'none'
+            }
         ]
     }
     
@@ -1,7 +1,25 @@
+from django.db.models import Case, ExpressionWrapper, F, FloatField, Prefetch, Value, When
+from django.db.models.functions import Cast
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from functools import lru_cache
 from rest_framework import serializers
 from .models import Student, Department, Batch, StudentBacklog, StudentMentor, StudentNote
 
 
+@lru_cache(maxsize=2048)
+def _batch_info(batch_id):
+    """Return (batch_name, department_name) for a batch, cached per process"""
+    batch = Batch.objects.select_related('department').only('name', 'department__name').get(pk=batch_id)
+    return batch.name, batch.department.name
+
+
+@receiver([post_save, post_delete], sender=Batch)
+@receiver([post_save, post_delete], sender=Department)
+def _clear_batch_info(sender, **kwargs):
+    _batch_info.cache_clear()
+
+
 class DepartmentSerializer(serializers.ModelSerializer):
     class Meta:
         model = Department
@@ -19,7 +37,10 @@ class BatchSerializer(serializers.ModelSerializer):
 class StudentBacklogSerializer(serializers.ModelSerializer):
     class Meta:
         model = StudentBacklog
-        fields = '__all__'
+        fields = [
+            'id', 'student', 'subject_name', 'subject_code', 'semester', 'academic_year',
+            'status', 'failed_date', 'cleared_date', 'created_at', 'updated_at'
+        ]
 
 
 class StudentNoteSerializer(serializers.ModelSerializer):
@@ -27,7 +48,22 @@ class StudentNoteSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = StudentNote
-        fields = '__all__'
+        fields = [
+            'id', 'student', 'mentor', 'created_by', 'created_by_name', 'note_text', 'title',
+            'note_type', 'is_private', 'is_important', 'created_at', 'updated_at'
+        ]
+
+
+class StudentNoteListSerializer(serializers.ModelSerializer):
+    """Lightweight note serializer for list views; leaves out the note_text body"""
+    
+    class Meta:
+        model = StudentNote
+        fields = ['id', 'student', 'title', 'note_type', 'is_important', 'created_at']
+    
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        return queryset.defer('note_text')
 
 
 class StudentMentorSerializer(serializers.ModelSerializer):
@@ -40,27 +76,67 @@ class StudentMentorSerializer(serializers.ModelSerializer):
 
 
 class StudentSerializer(serializers.ModelSerializer):
-    department_name = serializers.CharField(source='department.name', read_only=True)
+    department_name = serializers.CharField(source='batch.department.name', read_only=True)
     batch_name = serializers.CharField(source='batch.name', read_only=True)
     backlogs = StudentBacklogSerializer(many=True, read_only=True)
     notes = StudentNoteSerializer(many=True, read_only=True)
     mentors = StudentMentorSerializer(many=True, read_only=True)
+    # Fee amounts in rupees, backed by the *_cents columns
+    total_fee_amount = serializers.FloatField(required=False, min_value=0)
+    paid_amount = serializers.FloatField(required=False, min_value=0)
+    outstanding_fee = serializers.FloatField(read_only=True)
+    fee_payment_percentage = serializers.FloatField(read_only=True)
     
     class Meta:
         model = Student
-        fields = '__all__'
+        exclude = ('total_fee_amount_cents', 'paid_amount_cents')
         read_only_fields = ('created_at', 'updated_at', 'current_risk_score', 'risk_category')
+    
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """Load related rows up front to avoid N+1 queries when serializing"""
+        return queryset.select_related('batch', 'batch__department').prefetch_related(
+            Prefetch('backlogs', queryset=StudentBacklog.objects.all()),
+            'notes',
+            'mentors__mentor'
+        ).annotate(
+            # Let the database compute the fee figures in the same SELECT
+            outstanding_fee=ExpressionWrapper(
+                (F('total_fee_amount_cents') - F('paid_amount_cents')) / 100.0,
+                output_field=FloatField()
+            ),
+            fee_payment_percentage=Case(
+                When(total_fee_amount_cents=0, then=Value(100.0)),
+                default=Cast('paid_amount_cents', FloatField()) * 100.0 / Cast('total_fee_amount_cents', FloatField()),
+                output_field=FloatField()
+            )
+        )
 
 
 class StudentListSerializer(serializers.ModelSerializer):
     """Simplified serializer for list views"""
-    department_name = serializers.CharField(source='department.name', read_only=True)
-    batch_name = serializers.CharField(source='batch.name', read_only=True)
+    full_name = serializers.CharField(read_only=True)
+    department_name = serializers.SerializerMethodField()
+    batch_name = serializers.SerializerMethodField()
     
     class Meta:
         model = Student
         fields = [
-            'id', 'roll_number', 'full_name', 'email', 'phone',
+            'id', 'student_id', 'full_name', 'email', 'phone',
             'department_name', 'batch_name', 'current_semester',
             'current_risk_score', 'risk_category', 'is_active', 'created_at'
-        ]
\ No newline at end of file
+        ]
+    
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """Load only the listed columns (no address TextField); batch/department names come from _batch_info"""
+        return queryset.only(
+            'id', 'student_id', 'first_name', 'last_name', 'email', 'phone', 'batch',
+            'current_semester', 'current_risk_score', 'risk_category', 'is_active', 'created_at'
+        )
+    
+    def get_batch_name(self, obj):
+        return _batch_info(obj.batch_id)[0]
+    
+    def get_department_name(self, obj):
+        return _batch_info(obj.batch_id)[1]
\ No newline at end of file
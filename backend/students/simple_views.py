@@ -1,73 +1,123 @@
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from rest_framework import status
+from bson import ObjectId
+from bson.errors import InvalidId
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.core.cache import cache
 from django.http import JsonResponse
+from django.utils.http import quote_etag
+import hashlib
 import json
+import uuid
 from datetime import datetime, timedelta
 
 # Import MongoDB models directly
-from .models_mongo import Student, Department, Batch, StudentBacklog, Attendance
+from .models_mongo import Student, Department, Batch, StudentBacklog, Attendance, ref_id
+from .dashboard_summary import (
+    dashboard_summary, DASHBOARD_CACHE_KEY, ANALYTICS_CACHE_KEY, STUDENT_LIST_VERSION_KEY
+)
+
+# Dashboard aggregates are cached briefly; invalidate_dashboard_summary clears them
+DASHBOARD_CACHE_TIMEOUT = 45
+
+STUDENT_PAGE_SIZE = 500
+MAX_STUDENT_PAGE_SIZE = 1000
+
+# Shared pool for running independent dashboard queries side by side
+_QUERY_POOL = ThreadPoolExecutor(max_workers=4)
+
+
+def _department_stats():
+    """Per-department totals and high-risk share: join batch -> department and group once"""
+    return list(Student.objects.aggregate([
+        {'$lookup': {
+            'from': Batch._get_collection_name(),
+            'localField': 'batch',
+            'foreignField': '_id',
+            'as': 'b'
+        }},
+        {'$unwind': '$b'},
+        {'$lookup': {
+            'from': Department._get_collection_name(),
+            'localField': 'b.department',
+            'foreignField': '_id',
+            'as': 'd'
+        }},
+        {'$unwind': '$d'},
+        {'$group': {
+            '_id': '$d._id',
+            'name': {'$first': '$d.name'},
+            'code': {'$first': '$d.code'},
+            'total_students': {'$sum': 1},
+            'high_risk_students': {'$sum': {'$cond': [{'$eq': ['$risk_category', 'high']}, 1, 0]}}
+        }},
+        {'$sort': {'name': 1}},
+        {'$project': {
+            '_id': 0,
+            'name': 1,
+            'code': 1,
+            'total_students': 1,
+            'high_risk_students': 1,
+            'risk_percentage': {'$round': [
+                {'$multiply': [{'$divide': ['$high_risk_students', '$total_students']}, 100]}, 2
+            ]}
+        }}
+    ]))
+
+
+def _sample_students():
+    """A few students with their batch names for quick access"""
+    return list(Student.objects.aggregate([
+        {'$limit': 10},
+        {'$lookup': {
+            'from': Batch._get_collection_name(),
+            'localField': 'batch',
+            'foreignField': '_id',
+            'as': 'b'
+        }},
+        {'$project': {
+            '_id': 0,
+            'student_id': 1,
+            'name': {'$concat': ['$first_name', ' ', '$last_name']},
+            'cgpa': 1,
+            'risk_category': 1,
+            'batch': {'$ifNull': [{'$arrayElemAt': ['$b.name', 0]}, 'N/A']}
+        }}
+    ]))
 
 
 @api_view(['GET'])
 def student_dashboard_stats(request):
     """Get dashboard statistics for students"""
     try:
-        # MongoDB queries
-        total_students = Student.objects.count()
-        high_risk_students = Student.objects.filter(risk_category='high').count()
-        medium_risk_students = Student.objects.filter(risk_category='medium').count()
-        low_risk_students = Student.objects.filter(risk_category='low').count()
-        active_students = Student.objects.filter(is_active=True).count()
-        
-        # Get recent enrollments (if field exists)
-        try:
-            thirty_days_ago = datetime.now() - timedelta(days=30)
-            recent_enrollments = Student.objects.filter(
-                enrollment_date__gte=thirty_days_ago
-            ).count()
-        except:
-            recent_enrollments = 0
+        cached = cache.get(DASHBOARD_CACHE_KEY)
+        if cached is not None:
+            return Response(cached)
         
-        # Average CGPA and attendance
-        students = list(Student.objects.all())
-        avg_cgpa = sum(s.cgpa for s in students) / len(students) if students else 0
-        avg_attendance = sum(s.attendance_percentage for s in students) / len(students) if students else 0
+        # The summary, department and sample queries are independent, so run
+        # them concurrently and wait for the slowest instead of their sum
+        summary_future = _QUERY_POOL.submit(dashboard_summary)
+        departments_future = _QUERY_POOL.submit(_department_stats)
+        samples_future = _QUERY_POOL.submit(_sample_students)
         
-        # Department statistics
-        departments_stats = []
-        departments = Department.objects.all()
+        # Headline counts and averages from the materialized summary document
+        totals = summary_future.result()
         
-        for dept in departments:
-            dept_batches = Batch.objects.filter(department=dept)
-            dept_students = Student.objects.filter(batch__in=dept_batches)
-            dept_count = dept_students.count()
-            
-            if dept_count > 0:
-                dept_high_risk = dept_students.filter(risk_category='high').count()
-                departments_stats.append({
-                    'name': dept.name,
-                    'code': dept.code,
-                    'total_students': dept_count,
-                    'high_risk_students': dept_high_risk,
-                    'risk_percentage': round((dept_high_risk / dept_count) * 100, 2)
-                })
+        total_students = totals.get('total', 0)
+        high_risk_students = totals.get('high', 0)
+        medium_risk_students = totals.get('medium', 0)
+        low_risk_students = totals.get('low', 0)
+        active_students = totals.get('active', 0)
+        recent_enrollments = totals.get('recent', 0)
+        avg_cgpa = totals.get('avg_cgpa') or 0
+        avg_attendance = totals.get('avg_attendance') or 0
         
-        # Sample students for quick access
-        sample_students = []
-        for student in Student.objects.all()[:10]:
-            try:
-                sample_students.append({
-                    'student_id': student.student_id,
-                    'name': f"{student.first_name} {student.last_name}",
-                    'cgpa': student.cgpa,
-                    'risk_category': student.risk_category,
-                    'batch': student.batch.name if student.batch else 'N/A'
-                })
-            except:
-                continue
+        departments_stats = departments_future.result()
+        sample_students = samples_future.result()
         
-        return Response({
+        payload = {
             'success': True,
             'data': {
                 'total_students': total_students,
@@ -81,7 +131,9 @@ def student_dashboard_stats(request):
                 'departments': departments_stats
             },
             'students': sample_students
-        })
+        }
+        cache.set(DASHBOARD_CACHE_KEY, payload, DASHBOARD_CACHE_TIMEOUT)
+        return Response(payload)
         
     except Exception as e:
         return Response({
@@ -95,44 +147,72 @@ def student_dashboard_stats(request):
 def student_analytics(request):
     """Get analytics data for students"""
     try:
-        # Risk distribution
-        high_risk = Student.objects.filter(risk_category='high').count()
-        medium_risk = Student.objects.filter(risk_category='medium').count()
-        low_risk = Student.objects.filter(risk_category='low').count()
+        cached = cache.get(ANALYTICS_CACHE_KEY)
+        if cached is not None:
+            return Response(cached)
+        
+        # Risk, CGPA and attendance distributions in one pass over the collection
+        facets = next(Student.objects.aggregate([
+            {'$facet': {
+                'risk': [{'$group': {'_id': '$risk_category', 'count': {'$sum': 1}}}],
+                'cgpa': [{'$bucket': {
+                    'groupBy': '$cgpa',
+                    'boundaries': [0, 6, 7, 8, 9, 10.01],
+                    'default': 'other',
+                    'output': {'count': {'$sum': 1}}
+                }}],
+                'attendance': [{'$bucket': {
+                    'groupBy': '$attendance_percentage',
+                    'boundaries': [0, 60, 70, 80, 90, 100.01],
+                    'default': 'other',
+                    'output': {'count': {'$sum': 1}}
+                }}]
+            }}
+        ]))
+        risk_counts = {row['_id']: row['count'] for row in facets['risk']}
+        cgpa_counts = {row['_id']: row['count'] for row in facets['cgpa']}
+        attendance_counts = {row['_id']: row['count'] for row in facets['attendance']}
+        
+        high_risk = risk_counts.get('high', 0)
+        medium_risk = risk_counts.get('medium', 0)
+        low_risk = risk_counts.get('low', 0)
         
         # CGPA distribution
-        students = list(Student.objects.all())
         cgpa_ranges = {
-            '9.0-10.0': len([s for s in students if s.cgpa >= 9.0]),
-            '8.0-8.9': len([s for s in students if 8.0 <= s.cgpa < 9.0]),
-            '7.0-7.9': len([s for s in students if 7.0 <= s.cgpa < 8.0]),
-            '6.0-6.9': len([s for s in students if 6.0 <= s.cgpa < 7.0]),
-            'Below 6.0': len([s for s in students if s.cgpa < 6.0])
+            '9.0-10.0': cgpa_counts.get(9, 0),
+            '8.0-8.9': cgpa_counts.get(8, 0),
+            '7.0-7.9': cgpa_counts.get(7, 0),
+            '6.0-6.9': cgpa_counts.get(6, 0),
+            'Below 6.0': cgpa_counts.get(0, 0)
         }
         
         # Attendance distribution
         attendance_ranges = {
-            '90-100%': len([s for s in students if s.attendance_percentage >= 90]),
-            '80-89%': len([s for s in students if 80 <= s.attendance_percentage < 90]),
-            '70-79%': len([s for s in students if 70 <= s.attendance_percentage < 80]),
-            '60-69%': len([s for s in students if 60 <= s.attendance_percentage < 70]),
-            'Below 60%': len([s for s in students if s.attendance_percentage < 60])
+            '90-100%': attendance_counts.get(90, 0),
+            '80-89%': attendance_counts.get(80, 0),
+            '70-79%': attendance_counts.get(70, 0),
+            '60-69%': attendance_counts.get(60, 0),
+            'Below 60%': attendance_counts.get(0, 0)
         }
         
         # Semester distribution
         semester_distribution = {}
-        for sem in range(1, 9):
-            sem_students = Student.objects.filter(current_semester=sem)
-            count = sem_students.count()
-            if count > 0:
-                high_risk_count = sem_students.filter(risk_category='high').count()
-                semester_distribution[f'Semester {sem}'] = {
-                    'total': count,
-                    'high_risk': high_risk_count,
-                    'percentage': round((high_risk_count / count) * 100, 2)
-                }
+        for row in Student.objects.aggregate([
+            {'$match': {'current_semester': {'$gte': 1, '$lte': 8}}},
+            {'$group': {
+                '_id': '$current_semester',
+                'total': {'$sum': 1},
+                'high': {'$sum': {'$cond': [{'$eq': ['$risk_category', 'high']}, 1, 0]}}
+            }},
+            {'$sort': {'_id': 1}}
+        ]):
+            semester_distribution[f"Semester {row['_id']}"] = {
+                'total': row['total'],
+                'high_risk': row['high'],
+                'percentage': round((row['high'] / row['total']) * 100, 2)
+            }
         
-        return Response({
+        payload = {
             'success': True,
             'analytics': {
                 'risk_distribution': {
@@ -144,7 +224,9 @@ def student_analytics(request):
                 'attendance_distribution': attendance_ranges,
                 'semester_distribution': semester_distribution
             }
-        })
+        }
+        cache.set(ANALYTICS_CACHE_KEY, payload, DASHBOARD_CACHE_TIMEOUT)
+        return Response(payload)
         
     except Exception as e:
         return Response({
@@ -154,38 +236,89 @@ def student_analytics(request):
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+def _student_list_version():
+    """Current student list cache version, seeding one if the cache has none"""
+    version = cache.get(STUDENT_LIST_VERSION_KEY)
+    if version is None:
+        cache.add(STUDENT_LIST_VERSION_KEY, uuid.uuid4().hex, None)
+        version = cache.get(STUDENT_LIST_VERSION_KEY)
+    return version
+
+
 @api_view(['GET'])
 def student_list(request):
-    """Get list of all students"""
+    """Get all students, or one keyset page when ?cursor=<last id>&limit=<n> is sent"""
     try:
-        students = []
+        try:
+            cursor = request.GET.get('cursor')
+            paginated = bool(cursor) or 'limit' in request.GET
+            limit = max(1, min(int(request.GET.get('limit', STUDENT_PAGE_SIZE)), MAX_STUDENT_PAGE_SIZE))
+            match = {'_id': {'$gt': ObjectId(cursor)}} if cursor else {}
+        except (ValueError, InvalidId):
+            return Response({
+                'success': False,
+                'message': 'Invalid cursor or limit'
+            }, status=status.HTTP_400_BAD_REQUEST)
         
-        for student in Student.objects.all():
-            try:
-                student_data = {
-                    'id': str(student.id),
-                    'student_id': student.student_id,
-                    'first_name': student.first_name,
-                    'last_name': student.last_name,
-                    'email': student.email,
-                    'cgpa': student.cgpa,
-                    'current_semester': student.current_semester,
-                    'attendance_percentage': student.attendance_percentage,
-                    'risk_category': student.risk_category,
-                    'is_active': student.is_active,
-                    'batch_name': student.batch.name if student.batch else 'N/A',
-                    'department_name': student.batch.department.name if student.batch and student.batch.department else 'N/A'
+        # Responses are cached per query string under the current list version,
+        # which invalidate_dashboard_summary replaces on every student write
+        etag = quote_etag(hashlib.md5(
+            f"{_student_list_version()}|{request.get_full_path()}".encode()
+        ).hexdigest())
+        if request.headers.get('If-None-Match') == etag:
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            cache_key = 'students:list:' + etag.strip('"')
+            payload = cache.get(cache_key)
+            if payload is None:
+                # Page on the _id index, then project only the listed fields and join
+                # batch/department server-side for that page. Clients that send no
+                # cursor or limit (the students and notifications pages) get every student.
+                page = [{'$match': match}, {'$sort': {'_id': 1}}]
+                if paginated:
+                    page.append({'$limit': limit})
+                students = list(Student.objects.aggregate(page + [
+                    {'$lookup': {
+                        'from': Batch._get_collection_name(),
+                        'localField': 'batch',
+                        'foreignField': '_id',
+                        'as': 'b'
+                    }},
+                    {'$unwind': {'path': '$b', 'preserveNullAndEmptyArrays': True}},
+                    {'$lookup': {
+                        'from': Department._get_collection_name(),
+                        'localField': 'b.department',
+                        'foreignField': '_id',
+                        'as': 'd'
+                    }},
+                    {'$unwind': {'path': '$d', 'preserveNullAndEmptyArrays': True}},
+                    {'$project': {
+                        '_id': 0,
+                        'id': {'$toString': '$_id'},
+                        'student_id': 1,
+                        'first_name': 1,
+                        'last_name': 1,
+                        'email': 1,
+                        'cgpa': 1,
+                        'current_semester': 1,
+                        'attendance_percentage': 1,
+                        'risk_category': 1,
+                        'is_active': 1,
+                        'batch_name': {'$ifNull': ['$b.name', 'N/A']},
+                        'department_name': {'$ifNull': ['$d.name', 'N/A']}
+                    }}
+                ]))
+                payload = {
+                    'success': True,
+                    'students': students,
+                    'count': len(students),
+                    'next_cursor': students[-1]['id'] if paginated and len(students) == limit else None
                 }
-                students.append(student_data)
-            except Exception as e:
-                # Skip students with data issues
-                continue
+                cache.set(cache_key, payload, settings.STUDENT_LIST_CACHE_TIMEOUT)
+            response = Response(payload)
         
-        return Response({
-            'success': True,
-            'students': students,
-            'count': len(students)
-        })
+        response['ETag'] = etag
+        return response
         
     except Exception as e:
         return Response({
@@ -195,34 +328,35 @@ def student_list(request):
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+def _student_counts_by_batch():
+    """Return {batch_id: student_count} from a single $group over students"""
+    return {
+        row['_id']: row['count']
+        for row in Student.objects.aggregate([{'$group': {'_id': '$batch', 'count': {'$sum': 1}}}])
+    }
+
+
 @api_view(['GET'])
 def department_list(request):
     """Get list of all departments"""
     try:
         departments = []
         
+        student_counts = _student_counts_by_batch()
+        dept_batches = {}
+        for batch in Batch.objects.no_dereference().only('department'):
+            dept_batches.setdefault(ref_id(batch.department), []).append(batch.id)
+        
         for dept in Department.objects.all():
-            try:
-                # Get batches for this department
-                dept_batches = Batch.objects.filter(department=dept)
-                batch_count = dept_batches.count()
-                
-                # Get students in those batches
-                dept_students = Student.objects.filter(batch__in=dept_batches)
-                student_count = dept_students.count()
-                
-                department_data = {
-                    'id': str(dept.id),
-                    'name': dept.name,
-                    'code': dept.code,
-                    'batch_count': batch_count,
-                    'student_count': student_count,
-                    'created_at': dept.created_at.isoformat() if dept.created_at else None
-                }
-                departments.append(department_data)
-            except Exception as e:
-                # Skip departments with data issues
-                continue
+            batch_ids = dept_batches.get(dept.id, [])
+            departments.append({
+                'id': str(dept.id),
+                'name': dept.name,
+                'code': dept.code,
+                'batch_count': len(batch_ids),
+                'student_count': sum(student_counts.get(batch_id, 0) for batch_id in batch_ids),
+                'created_at': dept.created_at.isoformat() if dept.created_at else None
+            })
         
         return Response({
             'success': True,
@@ -244,25 +378,20 @@ def batch_list(request):
     try:
         batches = []
         
-        for batch in Batch.objects.all():
-            try:
-                # Get students in this batch
-                batch_students = Student.objects.filter(batch=batch)
-                student_count = batch_students.count()
-                
-                batch_data = {
-                    'id': str(batch.id),
-                    'name': batch.name,
-                    'year': batch.year,
-                    'department_name': batch.department.name if batch.department else 'N/A',
-                    'department_code': batch.department.code if batch.department else 'N/A',
-                    'student_count': student_count,
-                    'created_at': batch.created_at.isoformat() if batch.created_at else None
-                }
-                batches.append(batch_data)
-            except Exception as e:
-                # Skip batches with data issues
-                continue
+        departments = {dept.id: dept for dept in Department.objects.only('name', 'code')}
+        student_counts = _student_counts_by_batch()
+        
+        for batch in Batch.objects.no_dereference():
+            dept = departments.get(ref_id(batch.department))
+            batches.append({
+                'id': str(batch.id),
+                'name': batch.name,
+                'year': batch.year,
+                'department_name': dept.name if dept else 'N/A',
+                'department_code': dept.code if dept else 'N/A',
+                'student_count': student_counts.get(batch.id, 0),
+                'created_at': batch.created_at.isoformat() if batch.created_at else None
+            })
         
         return Response({
             'success': True,
@@ -0,0 +1,41 @@
+from datetime import date
+
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from .models import Department, Batch, Student
+
+
+class StudentFeeUpdateTests(TestCase):
+    def setUp(self):
+        department = Department.objects.create(name='Computer Science Engineering', code='CSE')
+        batch = Batch.objects.create(name='CSE-2024', year=2024, department=department)
+        self.student = Student(
+            student_id='CSE2024001',
+            first_name='Asha',
+            last_name='Rao',
+            email='asha.rao@example.com',
+            date_of_birth=date(2003, 5, 15),
+            gender='F',
+            batch=batch,
+            current_semester=3,
+            cgpa=7.5,
+            attendance_percentage=85.0,
+            enrollment_date=date(2024, 7, 1),
+        )
+        self.student.total_fee_amount = 100000
+        self.student.paid_amount = 40000
+        self.student.save()
+        self.client = APIClient()
+
+    def test_patch_paid_amount_returns_updated_fee_figures(self):
+        response = self.client.patch(
+            reverse('student-detail', args=[self.student.pk]),
+            {'paid_amount': 75000},
+            format='json'
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['outstanding_fee'], 25000)
+        self.assertEqual(response.json()['fee_payment_percentage'], 75)
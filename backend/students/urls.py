@@ -35,6 +35,7 @@ urlpatterns = [
     # File Upload URLs
     path('upload/', views.upload_students_file, name='upload-students'),
     path('download-template/', views.download_sample_template, name='download-template'),
+    path('export/', views.export_students_csv, name='export-students'),
     
     # Admin URLs
     path('admin/dashboard/', views.admin_dashboard_stats, name='admin-dashboard'),
@@ -13,7 +13,7 @@ except ImportError:
     print("❌ MongoDB views not available, using Django ORM fallback")
 
 # Import file upload views
-from .file_upload_views import upload_students_file, download_sample_template
+from .file_upload_views import upload_students_file, download_sample_template, export_students_csv
 
 # Import admin views
 from .admin_views import (
@@ -31,10 +31,17 @@ from .models import Student, Department, Batch, StudentBacklog, StudentMentor, S
 from .serializers import (
     StudentSerializer, StudentListSerializer, DepartmentSerializer,
     BatchSerializer, StudentBacklogSerializer, StudentMentorSerializer,
-    StudentNoteSerializer
+    StudentNoteSerializer, StudentNoteListSerializer
 )
 
 
+class EagerStudentsMixin:
+    """Apply the serializer's eager loading to every student queryset the view builds"""
+    
+    def get_queryset(self):
+        return self.get_serializer_class().setup_eager_loading(super().get_queryset())
+
+
 class DepartmentListCreateView(generics.ListCreateAPIView):
     queryset = Department.objects.all()
     serializer_class = DepartmentSerializer
@@ -57,8 +64,8 @@ class BatchRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
     serializer_class = BatchSerializer
 
 
-class StudentListCreateView(generics.ListCreateAPIView):
-    queryset = Student.objects.select_related('batch').all()
+class StudentListCreateView(EagerStudentsMixin, generics.ListCreateAPIView):
+    queryset = Student.objects.all()
     serializer_class = StudentListSerializer
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['risk_category', 'current_semester', 'is_active', 'batch__department']
@@ -67,7 +74,7 @@ class StudentListCreateView(generics.ListCreateAPIView):
     ordering = ['-current_risk_score']
 
 
-class StudentRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
+class StudentRetrieveUpdateDestroyView(EagerStudentsMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Student.objects.select_related('batch').all()
     serializer_class = StudentSerializer
 
@@ -87,10 +94,22 @@ class StudentMentorListCreateView(generics.ListCreateAPIView):
 
 
 class StudentNoteListCreateView(generics.ListCreateAPIView):
-    queryset = StudentNote.objects.select_related('student').all()
+    queryset = StudentNote.objects.all()
     serializer_class = StudentNoteSerializer
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['student', 'note_type', 'is_important']
+    
+    def get_serializer_class(self):
+        # Listing skips the note_text bodies; the full notes come with the student detail
+        if self.request.method == 'GET':
+            return StudentNoteListSerializer
+        return StudentNoteSerializer
+    
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.request.method == 'GET':
+            queryset = StudentNoteListSerializer.setup_eager_loading(queryset)
+        return queryset
 
 
 # Django ORM fallback functions (only used if MongoDB views are not available)
@@ -3,74 +3,108 @@ from rest_framework.response import Response
 from rest_framework import status
 from django.http import JsonResponse
 import json
+import re
 from datetime import datetime, timedelta
 from django.utils import timezone
+from django.views.decorators.cache import cache_page
 
 try:
-    from .models_mongo import Student, Department, Batch, StudentBacklog, Attendance
+    from .models_mongo import (
+        Student, Department, Batch, StudentBacklog, Attendance, resolve_batches
+    )
     MONGODB_AVAILABLE = True
 except ImportError:
     MONGODB_AVAILABLE = False
     from .models import Student, Department, Batch, StudentBacklog, Attendance
 
+# The backend is fixed at import time; each view dispatches to the matching
+# *_mongo / *_orm helper bound below instead of branching per request
+DATABASE_TYPE = 'MongoDB' if MONGODB_AVAILABLE else 'SQLite'
+
+# Dashboard/analytics responses change slowly; cache them per URL briefly
+STATS_CACHE_SECONDS = 60
+
+STUDENT_PAGE_SIZE = 50
+MAX_STUDENT_PAGE_SIZE = 200
+
+# Student columns serialized by student_list
+STUDENT_LIST_FIELDS = (
+    'student_id', 'first_name', 'last_name', 'email', 'current_semester', 'cgpa',
+    'attendance_percentage', 'risk_category', 'current_risk_score', 'is_active'
+)
+
+# Histogram labels keyed by the lower bound of each range
+CGPA_RANGES = (('9.0-10.0', 9), ('8.0-8.9', 8), ('7.0-7.9', 7), ('6.0-6.9', 6), ('Below 6.0', 0))
+ATTENDANCE_RANGES = (('90-100%', 90), ('80-89%', 80), ('70-79%', 70), ('60-69%', 60), ('Below 60%', 0))
+
+
+def _dashboard_stats_mongo():
+    # The total comes from collection metadata; the averages need a full
+    # pass anyway, so the filtered counts ride along in one $group
+    thirty_days_ago = datetime.now() - timedelta(days=30)
+    collection = Student._get_collection()
+    total_students = collection.estimated_document_count()
+    stats = next(collection.aggregate([
+        {'$group': {
+            '_id': None,
+            'active': {'$sum': {'$cond': [{'$eq': ['$is_active', True]}, 1, 0]}},
+            'high': {'$sum': {'$cond': [{'$eq': ['$risk_category', 'high']}, 1, 0]}},
+            'medium': {'$sum': {'$cond': [{'$eq': ['$risk_category', 'medium']}, 1, 0]}},
+            'low': {'$sum': {'$cond': [{'$eq': ['$risk_category', 'low']}, 1, 0]}},
+            'recent': {'$sum': {'$cond': [{'$gte': ['$enrollment_date', thirty_days_ago]}, 1, 0]}},
+            'cgpa': {'$avg': '$cgpa'},
+            'att': {'$avg': '$attendance_percentage'}
+        }}
+    ]), {})
+    
+    return {
+        'total_students': total_students,
+        'active_students': stats.get('active', 0),
+        'high_risk_students': stats.get('high', 0),
+        'medium_risk_students': stats.get('medium', 0),
+        'low_risk_students': stats.get('low', 0),
+        'recent_enrollments': stats.get('recent', 0),
+        'avg_cgpa': stats.get('cgpa') or 0,
+        'avg_attendance': stats.get('att') or 0
+    }
+
+
+def _dashboard_stats_orm():
+    from django.db.models import Avg, Count, Q
+    risk_counts = dict(
+        Student.objects.values_list('risk_category').annotate(count=Count('id')).order_by()
+    )
+    
+    thirty_days_ago = timezone.now().date() - timedelta(days=30)
+    stats = Student.objects.aggregate(
+        active=Count('id', filter=Q(is_active=True)),
+        recent=Count('id', filter=Q(enrollment_date__gte=thirty_days_ago)),
+        cgpa=Avg('cgpa'),
+        att=Avg('attendance_percentage')
+    )
+    
+    return {
+        'total_students': sum(risk_counts.values()),
+        'active_students': stats['active'],
+        'high_risk_students': risk_counts.get('high', 0),
+        'medium_risk_students': risk_counts.get('medium', 0),
+        'low_risk_students': risk_counts.get('low', 0),
+        'recent_enrollments': stats['recent'],
+        'avg_cgpa': stats['cgpa'] or 0,
+        'avg_attendance': stats['att'] or 0
+    }
+
 
 @api_view(['GET'])
+@cache_page(STATS_CACHE_SECONDS)
 def student_dashboard_stats(request):
     """Get dashboard statistics for students"""
     try:
-        if MONGODB_AVAILABLE:
-            # MongoDB queries
-            total_students = Student.objects.count()
-            high_risk_students = Student.objects.filter(risk_category='high').count()
-            medium_risk_students = Student.objects.filter(risk_category='medium').count()
-            low_risk_students = Student.objects.filter(risk_category='low').count()
-            active_students = Student.objects.filter(is_active=True).count()
-            
-            # Get recent enrollments (last 30 days)
-            try:
-                thirty_days_ago = datetime.now() - timedelta(days=30)
-                recent_enrollments = Student.objects.filter(
-                    enrollment_date__gte=thirty_days_ago
-                ).count()
-            except:
-                # If enrollment_date field doesn't exist or has issues, default to 0
-                recent_enrollments = 0
-            
-            # Average CGPA
-            students = list(Student.objects.all())
-            avg_cgpa = sum(s.cgpa for s in students) / len(students) if students else 0
-            
-            # Average attendance
-            avg_attendance = sum(s.attendance_percentage for s in students) / len(students) if students else 0
-            
-        else:
-            # Django ORM fallback
-            total_students = Student.objects.count()
-            high_risk_students = Student.objects.filter(risk_category='high').count()
-            medium_risk_students = Student.objects.filter(risk_category='medium').count()
-            low_risk_students = Student.objects.filter(risk_category='low').count()
-            active_students = Student.objects.filter(is_active=True).count()
-            
-            thirty_days_ago = timezone.now().date() - timedelta(days=30)
-            recent_enrollments = Student.objects.filter(
-                enrollment_date__gte=thirty_days_ago
-            ).count()
-            
-            from django.db.models import Avg
-            avg_cgpa = Student.objects.aggregate(Avg('cgpa'))['cgpa__avg'] or 0
-            avg_attendance = Student.objects.aggregate(Avg('attendance_percentage'))['attendance_percentage__avg'] or 0
-
-        return Response({
-            'total_students': total_students,
-            'active_students': active_students,
-            'high_risk_students': high_risk_students,
-            'medium_risk_students': medium_risk_students,
-            'low_risk_students': low_risk_students,
-            'recent_enrollments': recent_enrollments,
-            'avg_cgpa': round(avg_cgpa, 2),
-            'avg_attendance': round(avg_attendance, 2),
-            'database_type': 'MongoDB' if MONGODB_AVAILABLE else 'SQLite'
-        })
+        stats = _dashboard_stats()
+        stats['avg_cgpa'] = round(stats['avg_cgpa'], 2)
+        stats['avg_attendance'] = round(stats['avg_attendance'], 2)
+        stats['database_type'] = DATABASE_TYPE
+        return Response(stats)
         
     except Exception as e:
         return Response(
@@ -79,94 +113,102 @@ def student_dashboard_stats(request):
         )
 
 
+def _analytics_mongo():
+    """Risk counts, department distribution and range counts keyed by lower bound"""
+    # Risk, department and histogram counts from one $facet pass
+    facets = next(Student._get_collection().aggregate([
+        {'$facet': {
+            'risk': [{'$group': {'_id': '$risk_category', 'count': {'$sum': 1}}}],
+            # Count per batch first so $lookup runs once per batch, not per student
+            'department': [
+                {'$group': {'_id': '$batch', 'count': {'$sum': 1}}},
+                {'$lookup': {
+                    'from': Batch._get_collection_name(),
+                    'localField': '_id',
+                    'foreignField': '_id',
+                    'as': 'b'
+                }},
+                {'$unwind': '$b'},
+                {'$group': {'_id': '$b.department', 'count': {'$sum': '$count'}}}
+            ],
+            'cgpa': [{'$bucket': {
+                'groupBy': '$cgpa',
+                'boundaries': [0, 6, 7, 8, 9, 10.01],
+                'default': 'other',
+                'output': {'count': {'$sum': 1}}
+            }}],
+            'attendance': [{'$bucket': {
+                'groupBy': '$attendance_percentage',
+                'boundaries': [0, 60, 70, 80, 90, 101],
+                'default': 'other',
+                'output': {'count': {'$sum': 1}}
+            }}]
+        }}
+    ]))
+    
+    risk_counts = {row['_id']: row['count'] for row in facets['risk']}
+    
+    # Attach the counts to every department, including empty ones
+    dept_counts = {row['_id']: row['count'] for row in facets['department']}
+    dept_distribution = [
+        {'name': dept['name'], 'code': dept['code'], 'count': dept_counts.get(dept['_id'], 0)}
+        for dept in Department._get_collection().find({}, {'name': 1, 'code': 1})
+    ]
+    
+    cgpa_counts = {row['_id']: row['count'] for row in facets['cgpa']}
+    attendance_counts = {row['_id']: row['count'] for row in facets['attendance']}
+    return risk_counts, dept_distribution, cgpa_counts, attendance_counts
+
+
+def _analytics_orm():
+    """Risk counts, department distribution and range counts keyed by lower bound"""
+    from django.db.models import Count, Q
+    risk_counts = dict(
+        Student.objects.values_list('risk_category').annotate(count=Count('id')).order_by()
+    )
+    
+    dept_distribution = list(
+        Department.objects.annotate(count=Count('batch__student')).values('name', 'code', 'count')
+    )
+    
+    # Both histograms as conditional counts in a single SELECT
+    range_counts = Student.objects.aggregate(
+        c9=Count('id', filter=Q(cgpa__gte=9.0)),
+        c8=Count('id', filter=Q(cgpa__gte=8.0, cgpa__lt=9.0)),
+        c7=Count('id', filter=Q(cgpa__gte=7.0, cgpa__lt=8.0)),
+        c6=Count('id', filter=Q(cgpa__gte=6.0, cgpa__lt=7.0)),
+        c0=Count('id', filter=Q(cgpa__lt=6.0)),
+        a90=Count('id', filter=Q(attendance_percentage__gte=90)),
+        a80=Count('id', filter=Q(attendance_percentage__gte=80, attendance_percentage__lt=90)),
+        a70=Count('id', filter=Q(attendance_percentage__gte=70, attendance_percentage__lt=80)),
+        a60=Count('id', filter=Q(attendance_percentage__gte=60, attendance_percentage__lt=70)),
+        a0=Count('id', filter=Q(attendance_percentage__lt=60))
+    )
+    
+    cgpa_counts = {bound: range_counts[f'c{bound}'] for _, bound in CGPA_RANGES}
+    attendance_counts = {bound: range_counts[f'a{bound}'] for _, bound in ATTENDANCE_RANGES}
+    return risk_counts, dept_distribution, cgpa_counts, attendance_counts
+
+
 @api_view(['GET'])
+@cache_page(STATS_CACHE_SECONDS)
 def student_analytics(request):
     """Get analytics data for students"""
     try:
-        if MONGODB_AVAILABLE:
-            # MongoDB queries
-            students = list(Student.objects.all())
-            
-            # Risk distribution
-            risk_distribution = {
-                'high': Student.objects.filter(risk_category='high').count(),
-                'medium': Student.objects.filter(risk_category='medium').count(),
-                'low': Student.objects.filter(risk_category='low').count()
-            }
-            
-            # Department-wise distribution
-            departments = list(Department.objects.all())
-            dept_distribution = []
-            for dept in departments:
-                batches = list(Batch.objects.filter(department=dept))
-                dept_count = 0
-                for batch in batches:
-                    dept_count += Student.objects.filter(batch=batch).count()
-                dept_distribution.append({
-                    'name': dept.name,
-                    'code': dept.code,
-                    'count': dept_count
-                })
-            
-            # CGPA distribution
-            cgpa_ranges = {
-                '9.0-10.0': len([s for s in students if s.cgpa >= 9.0]),
-                '8.0-8.9': len([s for s in students if 8.0 <= s.cgpa < 9.0]),
-                '7.0-7.9': len([s for s in students if 7.0 <= s.cgpa < 8.0]),
-                '6.0-6.9': len([s for s in students if 6.0 <= s.cgpa < 7.0]),
-                'Below 6.0': len([s for s in students if s.cgpa < 6.0])
-            }
-            
-            # Attendance distribution
-            attendance_ranges = {
-                '90-100%': len([s for s in students if s.attendance_percentage >= 90]),
-                '80-89%': len([s for s in students if 80 <= s.attendance_percentage < 90]),
-                '70-79%': len([s for s in students if 70 <= s.attendance_percentage < 80]),
-                '60-69%': len([s for s in students if 60 <= s.attendance_percentage < 70]),
-                'Below 60%': len([s for s in students if s.attendance_percentage < 60])
-            }
-            
-        else:
-            # Django ORM fallback
-            risk_distribution = {
-                'high': Student.objects.filter(risk_category='high').count(),
-                'medium': Student.objects.filter(risk_category='medium').count(),
-                'low': Student.objects.filter(risk_category='low').count()
-            }
-            
-            dept_distribution = []
-            for dept in Department.objects.all():
-                dept_count = Student.objects.filter(batch__department=dept).count()
-                dept_distribution.append({
-                    'name': dept.name,
-                    'code': dept.code,
-                    'count': dept_count
-                })
-            
-            # For simplicity, using raw queries for ranges in Django
-            from django.db.models import Count, Q
-            cgpa_ranges = {
-                '9.0-10.0': Student.objects.filter(cgpa__gte=9.0).count(),
-                '8.0-8.9': Student.objects.filter(cgpa__gte=8.0, cgpa__lt=9.0).count(),
-                '7.0-7.9': Student.objects.filter(cgpa__gte=7.0, cgpa__lt=8.0).count(),
-                '6.0-6.9': Student.objects.filter(cgpa__gte=6.0, cgpa__lt=7.0).count(),
-                'Below 6.0': Student.objects.filter(cgpa__lt=6.0).count()
-            }
-            
-            attendance_ranges = {
-                '90-100%': Student.objects.filter(attendance_percentage__gte=90).count(),
-                '80-89%': Student.objects.filter(attendance_percentage__gte=80, attendance_percentage__lt=90).count(),
-                '70-79%': Student.objects.filter(attendance_percentage__gte=70, attendance_percentage__lt=80).count(),
-                '60-69%': Student.objects.filter(attendance_percentage__gte=60, attendance_percentage__lt=70).count(),
-                'Below 60%': Student.objects.filter(attendance_percentage__lt=60).count()
-            }
-
+        risk_counts, dept_distribution, cgpa_counts, attendance_counts = _analytics()
+        
+        # Any extra risk categories show up too
+        risk_distribution = {'high': 0, 'medium': 0, 'low': 0}
+        risk_distribution.update(risk_counts)
+        
         return Response({
             'risk_distribution': risk_distribution,
             'department_distribution': dept_distribution,
-            'cgpa_distribution': cgpa_ranges,
-            'attendance_distribution': attendance_ranges,
-            'database_type': 'MongoDB' if MONGODB_AVAILABLE else 'SQLite'
+            'cgpa_distribution': {label: cgpa_counts.get(bound, 0) for label, bound in CGPA_RANGES},
+            'attendance_distribution': {
+                label: attendance_counts.get(bound, 0) for label, bound in ATTENDANCE_RANGES
+            },
+            'database_type': DATABASE_TYPE
         })
         
     except Exception as e:
@@ -176,6 +218,89 @@ def student_analytics(request):
         )
 
 
+def _student_page_mongo(risk_category, department, semester, search, offset, page_size):
+    """Return (total_count, rows) for one page of the filtered student list"""
+    # Raw PyMongo: the page only needs scalar fields, so skip building
+    # Student documents and work with the projected dicts directly
+    query = {}
+    
+    if risk_category:
+        query['risk_category'] = risk_category
+    if semester:
+        query['current_semester'] = int(semester)
+    
+    if department:
+        dept = Department._get_collection().find_one({'code': department}, {'_id': 1})
+        if dept:
+            query['batch'] = {'$in': Batch._get_collection().distinct('_id', {'department': dept['_id']})}
+    
+    collection = Student._get_collection()
+    if search:
+        # Whole-word matches through the text index; if nothing matches,
+        # fall back to one $or of start-anchored regexes (prefix search)
+        text_query = dict(query, **{'$text': {'$search': search}})
+        if collection.find_one(text_query, {'_id': 1}) is not None:
+            query = text_query
+        else:
+            prefix = {'$regex': f'^{re.escape(search)}', '$options': 'i'}
+            query['$or'] = [
+                {'first_name': prefix},
+                {'last_name': prefix},
+                {'student_id': prefix}
+            ]
+    
+    total_count = collection.count_documents(query)
+    
+    # A stable sort keeps pages consistent
+    projection = dict.fromkeys(STUDENT_LIST_FIELDS + ('batch',), 1)
+    projection['_id'] = 0
+    page_students = list(
+        collection.find(query, projection).sort('student_id', 1).skip(offset).limit(page_size)
+    )
+    
+    # Resolve the page's batches and departments in two queries
+    batch_info = resolve_batches({doc.get('batch') for doc in page_students})
+    student_list = []
+    for doc in page_students:
+        batch, dept = batch_info.get(doc.pop('batch', None), (None, None))
+        row = {field: doc.get(field) for field in STUDENT_LIST_FIELDS}
+        row['batch_name'] = batch.name if batch else 'N/A'
+        row['department_name'] = dept.name if dept else 'N/A'
+        student_list.append(row)
+    
+    return total_count, student_list
+
+
+def _student_page_orm(risk_category, department, semester, search, offset, page_size):
+    """Return (total_count, rows) for one page of the filtered student list"""
+    from django.db.models import F, Q
+    students = Student.objects.all()
+    
+    if risk_category:
+        students = students.filter(risk_category=risk_category)
+    if department:
+        students = students.filter(batch__department__code=department)
+    if semester:
+        students = students.filter(current_semester=int(semester))
+    if search:
+        students = students.filter(
+            Q(first_name__icontains=search) |
+            Q(last_name__icontains=search) |
+            Q(student_id__icontains=search)
+        )
+    
+    total_count = students.count()
+    
+    student_list = list(
+        students.values(
+            *STUDENT_LIST_FIELDS,
+            batch_name=F('batch__name'),
+            department_name=F('batch__department__name')
+        )[offset:offset + page_size]
+    )
+    return total_count, student_list
+
+
 @api_view(['GET'])
 def student_list(request):
     """Get list of students with filtering"""
@@ -185,93 +310,26 @@ def student_list(request):
         department = request.GET.get('department', None)
         semester = request.GET.get('semester', None)
         search = request.GET.get('search', None)
+        try:
+            page = max(int(request.GET.get('page', 1)), 1)
+            page_size = min(max(int(request.GET.get('page_size', STUDENT_PAGE_SIZE)), 1), MAX_STUDENT_PAGE_SIZE)
+        except ValueError:
+            return Response(
+                {'error': 'page and page_size must be integers'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        offset = (page - 1) * page_size
         
-        if MONGODB_AVAILABLE:
-            # MongoDB queries
-            query = {}
-            
-            if risk_category:
-                query['risk_category'] = risk_category
-            if semester:
-                query['current_semester'] = int(semester)
-            
-            students = Student.objects.filter(**query)
-            
-            if department:
-                dept = Department.objects.filter(code=department).first()
-                if dept:
-                    batches = Batch.objects.filter(department=dept)
-                    students = students.filter(batch__in=batches)
-            
-            if search:
-                # MongoDB text search (simplified)
-                students = students.filter(
-                    first_name__icontains=search
-                ) | students.filter(
-                    last_name__icontains=search
-                ) | students.filter(
-                    student_id__icontains=search
-                )
-            
-            # Convert to list for JSON serialization
-            student_list = []
-            for student in students[:50]:  # Limit to 50 results
-                student_data = {
-                    'student_id': student.student_id,
-                    'first_name': student.first_name,
-                    'last_name': student.last_name,
-                    'email': student.email,
-                    'current_semester': student.current_semester,
-                    'cgpa': student.cgpa,
-                    'attendance_percentage': student.attendance_percentage,
-                    'risk_category': student.risk_category,
-                    'current_risk_score': student.current_risk_score,
-                    'batch_name': student.batch.name,
-                    'department_name': student.batch.department.name,
-                    'is_active': student.is_active
-                }
-                student_list.append(student_data)
-            
-        else:
-            # Django ORM fallback
-            students = Student.objects.all()
-            
-            if risk_category:
-                students = students.filter(risk_category=risk_category)
-            if department:
-                students = students.filter(batch__department__code=department)
-            if semester:
-                students = students.filter(current_semester=int(semester))
-            if search:
-                from django.db.models import Q
-                students = students.filter(
-                    Q(first_name__icontains=search) |
-                    Q(last_name__icontains=search) |
-                    Q(student_id__icontains=search)
-                )
-            
-            student_list = []
-            for student in students[:50]:
-                student_data = {
-                    'student_id': student.student_id,
-                    'first_name': student.first_name,
-                    'last_name': student.last_name,
-                    'email': student.email,
-                    'current_semester': student.current_semester,
-                    'cgpa': student.cgpa,
-                    'attendance_percentage': student.attendance_percentage,
-                    'risk_category': student.risk_category,
-                    'current_risk_score': student.current_risk_score,
-                    'batch_name': student.batch.name,
-                    'department_name': student.batch.department.name,
-                    'is_active': student.is_active
-                }
-                student_list.append(student_data)
+        total_count, student_list = _student_page(
+            risk_category, department, semester, search, offset, page_size
+        )
 
         return Response({
             'students': student_list,
-            'total_count': len(student_list),
-            'database_type': 'MongoDB' if MONGODB_AVAILABLE else 'SQLite'
+            'total_count': total_count,
+            'page': page,
+            'page_size': page_size,
+            'database_type': DATABASE_TYPE
         })
         
     except Exception as e:
@@ -281,101 +339,105 @@ def student_list(request):
         )
 
 
+def _student_detail_mongo(student_id):
+    """Return (student, backlogs, last 12 attendance records), or None if not found"""
+    student = Student.objects.filter(student_id=student_id).first()
+    if not student:
+        return None
+    
+    backlogs = list(StudentBacklog.objects.filter(student=student))
+    attendance_records = list(
+        Attendance.objects.filter(student=student).order_by('-year', '-month').limit(12)
+    )
+    return student, backlogs, attendance_records
+
+
+def _student_detail_orm(student_id):
+    """Return (student, backlogs, last 12 attendance records), or None if not found"""
+    from django.db.models import Prefetch
+    try:
+        student = Student.objects.select_related('batch', 'batch__department').prefetch_related(
+            Prefetch(
+                'monthly_attendance',
+                queryset=Attendance.objects.order_by('-year', '-month')[:12],
+                to_attr='recent_attendance'
+            ),
+            Prefetch('backlogs', queryset=StudentBacklog.objects.all(), to_attr='backlog_list')
+        ).get(student_id=student_id)
+    except Student.DoesNotExist:
+        return None
+    return student, student.backlog_list, student.recent_attendance
+
+
 @api_view(['GET'])
 def student_detail(request, student_id):
     """Get detailed information for a specific student"""
     try:
-        if MONGODB_AVAILABLE:
-            student = Student.objects.filter(student_id=student_id).first()
-            if not student:
-                return Response(
-                    {'error': 'Student not found'}, 
-                    status=status.HTTP_404_NOT_FOUND
-                )
-            
-            # Get related data
-            backlogs = list(StudentBacklog.objects.filter(student=student))
-            attendance_records = list(Attendance.objects.filter(student=student).order_by('-year', '-month'))
-            
-            student_data = {
-                'student_id': student.student_id,
-                'first_name': student.first_name,
-                'last_name': student.last_name,
-                'email': student.email,
-                'phone': student.phone,
-                'date_of_birth': student.date_of_birth.isoformat() if student.date_of_birth else None,
-                'gender': student.gender,
-                'current_semester': student.current_semester,
-                'cgpa': student.cgpa,
-                'attendance_percentage': student.attendance_percentage,
-                'risk_category': student.risk_category,
-                'current_risk_score': student.current_risk_score,
-                'batch_name': student.batch.name,
-                'department_name': student.batch.department.name,
-                'family_income': student.family_income,
-                'distance_from_home': student.distance_from_home,
-                'is_hosteler': student.is_hosteler,
-                'is_active': student.is_active,
-                'enrollment_date': student.enrollment_date.isoformat() if student.enrollment_date else None,
-                'backlogs': [
-                    {
-                        'subject_name': b.subject_name,
-                        'semester': b.semester,
-                        'status': b.status
-                    } for b in backlogs
-                ],
-                'attendance_records': [
-                    {
-                        'month': a.month,
-                        'year': a.year,
-                        'classes_held': a.classes_held,
-                        'classes_attended': a.classes_attended,
-                        'percentage': a.attendance_percentage
-                    } for a in attendance_records[:12]  # Last 12 months
-                ]
-            }
-            
-        else:
-            # Django ORM fallback
-            try:
-                student = Student.objects.get(student_id=student_id)
-            except Student.DoesNotExist:
-                return Response(
-                    {'error': 'Student not found'}, 
-                    status=status.HTTP_404_NOT_FOUND
-                )
-            
-            student_data = {
-                'student_id': student.student_id,
-                'first_name': student.first_name,
-                'last_name': student.last_name,
-                'email': student.email,
-                'phone': student.phone,
-                'date_of_birth': student.date_of_birth.isoformat() if student.date_of_birth else None,
-                'gender': student.gender,
-                'current_semester': student.current_semester,
-                'cgpa': student.cgpa,
-                'attendance_percentage': student.attendance_percentage,
-                'risk_category': student.risk_category,
-                'current_risk_score': student.current_risk_score,
-                'batch_name': student.batch.name,
-                'department_name': student.batch.department.name if hasattr(student.batch, 'department') else 'N/A',
-                'family_income': student.family_income,
-                'distance_from_home': student.distance_from_home,
-                'is_hosteler': student.is_hosteler,
-                'is_active': student.is_active,
-                'enrollment_date': student.enrollment_date.isoformat() if student.enrollment_date else None,
-                'backlogs': [],
-                'attendance_records': []
-            }
+        found = _student_detail(student_id)
+        if found is None:
+            return Response(
+                {'error': 'Student not found'}, 
+                status=status.HTTP_404_NOT_FOUND
+            )
+        student, backlogs, attendance_records = found
+        
+        student_data = {
+            'student_id': student.student_id,
+            'first_name': student.first_name,
+            'last_name': student.last_name,
+            'email': student.email,
+            'phone': student.phone,
+            'date_of_birth': student.date_of_birth.isoformat() if student.date_of_birth else None,
+            'gender': student.gender,
+            'current_semester': student.current_semester,
+            'cgpa': student.cgpa,
+            'attendance_percentage': student.attendance_percentage,
+            'risk_category': student.risk_category,
+            'current_risk_score': student.current_risk_score,
+            'batch_name': student.batch.name,
+            'department_name': student.batch.department.name,
+            'family_income': student.family_income,
+            'distance_from_home': student.distance_from_home,
+            'is_hosteler': student.is_hosteler,
+            'is_active': student.is_active,
+            'enrollment_date': student.enrollment_date.isoformat() if student.enrollment_date else None,
+            'backlogs': [
+                {
+                    'subject_name': b.subject_name,
+                    'semester': b.semester,
+                    'status': b.status
+                } for b in backlogs
+            ],
+            'attendance_records': [
+                {
+                    'month': a.month,
+                    'year': a.year,
+                    'classes_held': a.classes_held,
+                    'classes_attended': a.classes_attended,
+                    'percentage': a.attendance_percentage
+                } for a in attendance_records  # Last 12 months
+            ]
+        }
 
         return Response({
             'student': student_data,
-            'database_type': 'MongoDB' if MONGODB_AVAILABLE else 'SQLite'
+            'database_type': DATABASE_TYPE
         })
         
     except Exception as e:
         return Response(
             {'error': f'Error fetching student details: {str(e)}'}, 
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
-        )
\ No newline at end of file
+        )
+
+
+if MONGODB_AVAILABLE:
+    _dashboard_stats = _dashboard_stats_mongo
+    _analytics = _analytics_mongo
+    _student_page = _student_page_mongo
+    _student_detail = _student_detail_mongo
+else:
+    _dashboard_stats = _dashboard_stats_orm
+    _analytics = _analytics_orm
+    _student_page = _student_page_orm
+    _student_detail = _student_detail_orm
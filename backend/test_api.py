@@ -1,5 +1,7 @@
 import requests
 import json
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
 
 def test_api_endpoints():
     base_url = "http://127.0.0.1:8000"
@@ -15,18 +17,33 @@ def test_api_endpoints():
     print("Testing Django API endpoints...")
     print("=" * 50)
     
-    for endpoint in endpoints:
+    # One keep-alive session shared by all workers
+    session = requests.Session()
+    session.mount('http://', HTTPAdapter(pool_connections=8, pool_maxsize=8))
+    
+    def fetch(endpoint):
         try:
-            response = requests.get(f"{base_url}{endpoint}", timeout=5)
+            return session.get(f"{base_url}{endpoint}", timeout=5)
+        except requests.exceptions.RequestException as e:
+            return e
+    
+    with session, ThreadPoolExecutor(max_workers=len(endpoints)) as executor:
+        results = list(executor.map(fetch, endpoints))
+    
+    for endpoint, response in zip(endpoints, results):
+        if isinstance(response, Exception):
+            print(f"❌ {endpoint}: Connection failed - {response}")
+        else:
             print(f"✅ {endpoint}: {response.status_code}")
             if response.status_code == 200:
-                data = response.json()
-                print(f"   Response: {json.dumps(data, indent=2)[:100]}...")
+                try:
+                    data = response.json()
+                    print(f"   Response: {json.dumps(data, indent=2)[:100]}...")
+                except ValueError:
+                    print(f"   Response: {response.text[:100]}...")
             else:
                 print(f"   Error: {response.text[:100]}...")
-        except requests.exceptions.RequestException as e:
-            print(f"❌ {endpoint}: Connection failed - {e}")
         print("-" * 30)
 
 if __name__ == "__main__":
-    test_api_endpoints()
\ No newline at end of file
+    test_api_endpoints()
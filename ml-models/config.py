@@ -2,18 +2,36 @@
 Configuration file for ML models and data processing
 """
 import os
+from functools import lru_cache
 from pathlib import Path
 
+import numpy as np
+
 # Base directories
 BASE_DIR = Path(__file__).resolve().parent
 MODELS_DIR = BASE_DIR / 'models'
 DATA_DIR = BASE_DIR / 'data'
 SCRIPTS_DIR = BASE_DIR / 'scripts'
+LOGS_DIR = BASE_DIR / 'logs'
+
+
+# Directories are created on first use rather than at import time
+@lru_cache(maxsize=None)
+def models_dir():
+    MODELS_DIR.mkdir(parents=True, exist_ok=True)
+    return MODELS_DIR
+
 
-# Ensure directories exist
-MODELS_DIR.mkdir(exist_ok=True)
-DATA_DIR.mkdir(exist_ok=True)
-SCRIPTS_DIR.mkdir(exist_ok=True)
+@lru_cache(maxsize=None)
+def data_dir():
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
+    return DATA_DIR
+
+
+@lru_cache(maxsize=None)
+def logs_dir():
+    LOGS_DIR.mkdir(parents=True, exist_ok=True)
+    return LOGS_DIR
 
 # Model Configuration
 MODEL_CONFIG = {
@@ -140,6 +158,12 @@ PREDICTION_CONFIG = {
     }
 }
 
+# risk_categories as a boundary table for np.digitize(scores, RISK_BINS, right=True);
+# a score equal to a category's upper bound stays in that category
+_RISK_CATEGORY_ORDER = sorted(PREDICTION_CONFIG['risk_categories'].items(), key=lambda item: item[1][1])
+RISK_BINS = np.array([bounds[1] for _, bounds in _RISK_CATEGORY_ORDER[:-1]], dtype=np.float32)
+RISK_LABELS = np.array([label for label, _ in _RISK_CATEGORY_ORDER])
+
 # Monitoring and Retraining Configuration
 MONITORING_CONFIG = {
     'model_performance_threshold': 0.75,  # Minimum AUC score
@@ -153,28 +177,47 @@ MONITORING_CONFIG = {
 }
 
 # File paths
-MODEL_PATHS = {
-    'logistic_regression': MODELS_DIR / MODEL_CONFIG['logistic_regression']['file_name'],
-    'decision_tree': MODELS_DIR / MODEL_CONFIG['decision_tree']['file_name'],
-    'scaler': MODELS_DIR / 'feature_scaler.joblib',
-    'feature_selector': MODELS_DIR / 'feature_selector.joblib',
-    'label_encoder': MODELS_DIR / 'label_encoder.joblib'
+MODEL_FILES = {
+    'logistic_regression': MODEL_CONFIG['logistic_regression']['file_name'],
+    'decision_tree': MODEL_CONFIG['decision_tree']['file_name'],
+    'scaler': 'feature_scaler.joblib',
+    'feature_selector': 'feature_selector.joblib',
+    'label_encoder': 'label_encoder.joblib'
 }
 
-DATA_PATHS = {
-    'raw_data': DATA_DIR / 'raw_student_data.csv',
-    'processed_data': DATA_DIR / 'processed_student_data.csv',
-    'training_data': DATA_DIR / 'training_data.csv',
-    'test_data': DATA_DIR / 'test_data.csv',
-    'sample_data': DATA_DIR / 'sample_data.csv'
+DATA_FILES = {
+    'raw_data': 'raw_student_data.csv',
+    'processed_data': 'processed_student_data.csv',
+    'training_data': 'training_data.parquet',
+    'test_data': 'test_data.parquet',
+    'sample_data': 'sample_data.parquet'
 }
 
+# Columnar storage for the files the pipeline writes itself
+PARQUET_OPTIONS = {'engine': 'pyarrow', 'compression': 'zstd', 'index': False}
+
+# joblib persistence: lz4 decompresses near memory speed, zlib is the stdlib fallback
+try:
+    import lz4  # noqa: F401
+    JOBLIB_COMPRESS = ('lz4', 3)
+except ImportError:
+    JOBLIB_COMPRESS = ('zlib', 3)
+JOBLIB_PROTOCOL = 5
+
+
+def get_model_path(name):
+    """Path of a saved model artifact, creating the models directory if needed"""
+    return models_dir() / MODEL_FILES[name]
+
+
+def get_data_path(name):
+    """Path of a data file, creating the data directory if needed"""
+    return data_dir() / DATA_FILES[name]
+
+
 # Logging Configuration
 LOGGING_CONFIG = {
     'level': 'INFO',
     'format': '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    'file': BASE_DIR / 'logs' / 'ml_pipeline.log'
+    'file': LOGS_DIR / 'ml_pipeline.log'  # Call logs_dir() before opening it
 }
-
-# Create logs directory
-(BASE_DIR / 'logs').mkdir(exist_ok=True)
\ No newline at end of file
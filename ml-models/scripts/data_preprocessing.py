@@ -3,18 +3,165 @@ Data preprocessing module for dropout prediction ML pipeline
 """
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
 from sklearn.preprocessing import StandardScaler, LabelEncoder
 from sklearn.impute import SimpleImputer
 from sklearn.model_selection import train_test_split
 import joblib
 import logging
+from concurrent.futures import ProcessPoolExecutor
 from typing import Tuple, Dict, Any
 from config import *
 
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 # Set up logging
 logging.basicConfig(**LOGGING_CONFIG)
 logger = logging.getLogger(__name__)
 
+# calculate_risk_score factors: (column, ascending thresholds, points per step).
+# A value equal to a threshold falls into the step above it.
+RISK_SCORE_STEPS = (
+    # Attendance risk (30% weight): < 60 -> 30, < 75 -> 15
+    ('overall_attendance_percentage', np.array([60, 75]), np.array([30.0, 15.0, 0.0])),
+    # Academic risk (35% weight): < 6 -> 35, < 7 -> 20
+    ('current_cgpa', np.array([6, 7]), np.array([35.0, 20.0, 0.0])),
+    # Backlog risk (20% weight): >= 3 -> 20, >= 1 -> 10
+    ('backlog_count', np.array([1, 3]), np.array([0.0, 10.0, 20.0])),
+    # Financial risk (15% weight): < 50 -> 15, < 80 -> 8
+    ('fee_payment_percentage', np.array([50, 80]), np.array([15.0, 8.0, 0.0])),
+)
+
+# Rows per chunk for prepare_data_streaming
+STREAMING_CHUNK_ROWS = 50_000
+
+# Above this many rows generate_sample_data splits the work across processes
+PARALLEL_SAMPLE_THRESHOLD = 200_000
+
+# critical_semester flag indexed by semester number (semesters 3, 4, 7 and 8)
+CRITICAL_SEMESTER_LUT = np.zeros(9, dtype=np.int8)
+CRITICAL_SEMESTER_LUT[[3, 4, 7, 8]] = 1
+
+
+def _clip_iqr_numpy(arr: np.ndarray) -> np.ndarray:
+    """Clip each column to its 1.5*IQR fences in place; returns per-column clip counts"""
+    q1, q3 = np.nanquantile(arr, [0.25, 0.75], axis=0)
+    iqr = q3 - q1
+    lower, upper = q1 - 1.5 * iqr, q3 + 1.5 * iqr
+    counts = ((arr < lower) | (arr > upper)).sum(axis=0)
+    np.clip(arr, lower, upper, out=arr)
+    return counts
+
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, cache=True)
+    def _clip_iqr(arr):
+        counts = np.zeros(arr.shape[1], dtype=np.int64)
+        for j in prange(arr.shape[1]):
+            col = arr[:, j]
+            q1 = np.nanquantile(col, 0.25)
+            q3 = np.nanquantile(col, 0.75)
+            lower = q1 - 1.5 * (q3 - q1)
+            upper = q3 + 1.5 * (q3 - q1)
+            for i in range(col.shape[0]):
+                # NaN fails both comparisons and is left for the imputer
+                if col[i] < lower:
+                    col[i] = lower
+                    counts[j] += 1
+                elif col[i] > upper:
+                    col[i] = upper
+                    counts[j] += 1
+        return counts
+else:
+    _clip_iqr = _clip_iqr_numpy
+
+
+def _risk_score(data: Dict, rng: np.random.Generator) -> np.ndarray:
+    """0-100 risk score from the RISK_SCORE_STEPS factors plus Gaussian noise"""
+    risk_score = np.zeros(len(data['overall_attendance_percentage']))
+    
+    # Each factor is a step function: searchsorted picks the step, the
+    # table gives its points, and everything accumulates into one buffer
+    for column, thresholds, points in RISK_SCORE_STEPS:
+        step = np.searchsorted(thresholds, data[column], side='right')
+        np.add(risk_score, points[step], out=risk_score)
+    
+    # Add some randomness
+    np.add(risk_score, rng.normal(0, 5, len(risk_score)), out=risk_score)
+    
+    return np.clip(risk_score, 0, 100, out=risk_score)
+
+
+def _sample_chunk(seed, n_samples: int) -> Dict[str, np.ndarray]:
+    """Columns for n_samples synthetic students drawn from one Generator"""
+    rng = np.random.default_rng(seed)
+    
+    # Draw each distribution family as one (n_samples, k) block and
+    # rescale the columns in place instead of one RNG call per feature
+    normal_loc = np.array([75, 0, 7.5, 0, 0, 85, 0.8, 0.1, 7.2])
+    normal_scale = np.array([15, 5, 1.2, 0.5, 0.3, 20, 0.2, 0.05, 0.8])
+    normal = rng.standard_normal((n_samples, len(normal_loc)))
+    normal *= normal_scale
+    normal += normal_loc
+    
+    exponential = rng.standard_exponential((n_samples, 7))
+    exponential *= np.array([5, 1, 10, 2, 3, 1, 50])
+    
+    poisson = rng.poisson([2, 0.5, 0.8, 0.2], size=(n_samples, 4))
+    
+    data = {}
+    
+    # Attendance features
+    data['overall_attendance_percentage'] = np.clip(normal[:, 0], 0, 100)
+    data['recent_attendance_trend'] = normal[:, 1]
+    data['consecutive_absences'] = poisson[:, 0]
+    data['attendance_variation'] = exponential[:, 0]
+    
+    # Academic features
+    data['current_cgpa'] = np.clip(normal[:, 2], 0, 10)
+    data['semester_gpa'] = np.clip(data['current_cgpa'] + normal[:, 3], 0, 10)
+    data['grade_trend'] = normal[:, 4]
+    data['failed_subjects'] = poisson[:, 1]
+    data['backlog_count'] = poisson[:, 2]
+    data['academic_consistency'] = exponential[:, 1]
+    
+    # Financial features
+    data['fee_payment_percentage'] = np.clip(normal[:, 5], 0, 100)
+    data['payment_delay_days'] = exponential[:, 2]
+    data['financial_assistance'] = (rng.random(n_samples) < 0.3).astype(int)
+    data['fee_payment_pattern'] = normal[:, 6]
+    
+    # Behavioral features
+    data['mentor_meeting_frequency'] = exponential[:, 3]
+    data['library_usage'] = exponential[:, 4]
+    data['extracurricular_participation'] = exponential[:, 5]
+    data['disciplinary_actions'] = poisson[:, 3]
+    
+    # Demographic features
+    data['semester'] = rng.integers(1, 9, n_samples)
+    data['department_dropout_rate'] = normal[:, 7]
+    data['batch_performance'] = normal[:, 8]
+    data['distance_from_home'] = exponential[:, 6]
+    
+    # Create target variable based on risk factors
+    risk_score = _risk_score(data, rng)
+    data['dropout_risk'] = (risk_score > 50).astype(int)  # Binary classification
+    data['risk_score'] = risk_score
+    
+    # Add some missing values to simulate real-world data, written into
+    # the float arrays before the frame exists rather than through df.loc
+    missing_cols = ['mentor_meeting_frequency', 'library_usage', 'extracurricular_participation']
+    for col in missing_cols:
+        missing_idx = rng.choice(n_samples, size=int(0.1 * n_samples), replace=False)
+        data[col][missing_idx] = np.nan
+    
+    return data
+
 
 class DataPreprocessor:
     """
@@ -28,11 +175,27 @@ class DataPreprocessor:
         self.categorical_imputer = SimpleImputer(strategy=DATA_CONFIG['missing_value_strategy']['categorical'])
         self.feature_columns = []
         self.target_column = 'dropout_risk'
-        
+        # (columns, numerical_cols, categorical_cols) from the last _classify call
+        self._schema_cache = None
+        
+    def _classify(self, df: pd.DataFrame) -> Tuple[list, list]:
+        """Numerical and categorical column names, cached while the columns stay the same"""
+        columns = tuple(df.columns)
+        if self._schema_cache is None or self._schema_cache[0] != columns:
+            self._schema_cache = (
+                columns,
+                df.select_dtypes(include=[np.number]).columns.tolist(),
+                df.select_dtypes(include=['object', 'category']).columns.tolist()
+            )
+        return self._schema_cache[1], self._schema_cache[2]
+    
     def load_data(self, file_path: str = None) -> pd.DataFrame:
         """Load data from CSV file or generate sample data"""
         if file_path and os.path.exists(file_path):
-            df = pd.read_csv(file_path)
+            if str(file_path).endswith('.parquet'):
+                df = pd.read_parquet(file_path, engine=PARQUET_OPTIONS['engine'])
+            else:
+                df = pd.read_csv(file_path)
             logger.info(f"Loaded data from {file_path} with shape {df.shape}")
         else:
             df = self.generate_sample_data()
@@ -41,89 +204,26 @@ class DataPreprocessor:
     
     def generate_sample_data(self, n_samples: int = 1000) -> pd.DataFrame:
         """Generate sample student data for training"""
-        np.random.seed(42)
-        
-        data = {}
-        
-        # Attendance features
-        attendance_pct = np.random.normal(75, 15, n_samples)
-        data['overall_attendance_percentage'] = np.clip(attendance_pct, 0, 100)
-        data['recent_attendance_trend'] = np.random.normal(0, 5, n_samples)
-        data['consecutive_absences'] = np.random.poisson(2, n_samples)
-        data['attendance_variation'] = np.random.exponential(5, n_samples)
-        
-        # Academic features
-        data['current_cgpa'] = np.random.normal(7.5, 1.2, n_samples)
-        data['current_cgpa'] = np.clip(data['current_cgpa'], 0, 10)
-        data['semester_gpa'] = data['current_cgpa'] + np.random.normal(0, 0.5, n_samples)
-        data['semester_gpa'] = np.clip(data['semester_gpa'], 0, 10)
-        data['grade_trend'] = np.random.normal(0, 0.3, n_samples)
-        data['failed_subjects'] = np.random.poisson(0.5, n_samples)
-        data['backlog_count'] = np.random.poisson(0.8, n_samples)
-        data['academic_consistency'] = np.random.exponential(1, n_samples)
-        
-        # Financial features
-        data['fee_payment_percentage'] = np.random.normal(85, 20, n_samples)
-        data['fee_payment_percentage'] = np.clip(data['fee_payment_percentage'], 0, 100)
-        data['payment_delay_days'] = np.random.exponential(10, n_samples)
-        data['financial_assistance'] = np.random.choice([0, 1], n_samples, p=[0.7, 0.3])
-        data['fee_payment_pattern'] = np.random.normal(0.8, 0.2, n_samples)
-        
-        # Behavioral features
-        data['mentor_meeting_frequency'] = np.random.exponential(2, n_samples)
-        data['library_usage'] = np.random.exponential(3, n_samples)
-        data['extracurricular_participation'] = np.random.exponential(1, n_samples)
-        data['disciplinary_actions'] = np.random.poisson(0.2, n_samples)
-        
-        # Demographic features
-        data['semester'] = np.random.choice(range(1, 9), n_samples)
-        data['department_dropout_rate'] = np.random.normal(0.1, 0.05, n_samples)
-        data['batch_performance'] = np.random.normal(7.2, 0.8, n_samples)
-        data['distance_from_home'] = np.random.exponential(50, n_samples)
-        
-        # Create target variable based on risk factors
-        risk_score = self.calculate_risk_score(data)
-        data['dropout_risk'] = (risk_score > 50).astype(int)  # Binary classification
-        data['risk_score'] = risk_score
-        
-        df = pd.DataFrame(data)
-        
-        # Add some missing values to simulate real-world data
-        missing_cols = ['mentor_meeting_frequency', 'library_usage', 'extracurricular_participation']
-        for col in missing_cols:
-            missing_idx = np.random.choice(df.index, size=int(0.1 * len(df)), replace=False)
-            df.loc[missing_idx, col] = np.nan
-        
-        return df
+        if n_samples <= PARALLEL_SAMPLE_THRESHOLD:
+            return pd.DataFrame(_sample_chunk(42, n_samples), copy=False)
+        
+        # Large benchmark sets: independent child seeds, one chunk per core
+        workers = os.cpu_count() or 1
+        seeds = np.random.SeedSequence(42).spawn(workers)
+        sizes = [n_samples // workers + (i < n_samples % workers) for i in range(workers)]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunks = list(executor.map(_sample_chunk, seeds, sizes))
+        
+        return pd.DataFrame(
+            {col: np.concatenate([chunk[col] for chunk in chunks]) for col in chunks[0]},
+            copy=False
+        )
     
-    def calculate_risk_score(self, data: Dict) -> np.ndarray:
+    def calculate_risk_score(self, data: Dict, rng: np.random.Generator = None) -> np.ndarray:
         """Calculate risk score based on multiple factors"""
-        risk_score = np.zeros(len(data['overall_attendance_percentage']))
-        
-        # Attendance risk (30% weight)
-        attendance_risk = np.where(data['overall_attendance_percentage'] < 60, 30,
-                                 np.where(data['overall_attendance_percentage'] < 75, 15, 0))
-        risk_score += attendance_risk
-        
-        # Academic risk (35% weight)
-        academic_risk = np.where(data['current_cgpa'] < 6, 35,
-                               np.where(data['current_cgpa'] < 7, 20, 0))
-        risk_score += academic_risk
-        
-        # Backlog risk (20% weight)
-        backlog_risk = np.where(data['backlog_count'] >= 3, 20,
-                              np.where(data['backlog_count'] >= 1, 10, 0))
-        risk_score += backlog_risk
-        
-        # Financial risk (15% weight)
-        fee_risk = np.where(data['fee_payment_percentage'] < 50, 15,
-                          np.where(data['fee_payment_percentage'] < 80, 8, 0))
-        risk_score += fee_risk
-        
-        # Add some randomness
-        risk_score += np.random.normal(0, 5, len(risk_score))
-        
-        return np.clip(risk_score, 0, 100)
+        if rng is None:
+            rng = np.random.default_rng()
+        return _risk_score(data, rng)
     
     def clean_data(self, df: pd.DataFrame) -> pd.DataFrame:
         """Clean and validate the data"""
@@ -134,19 +234,18 @@ class DataPreprocessor:
         df = df.drop_duplicates()
         logger.info(f"Removed {initial_shape[0] - df.shape[0]} duplicate rows")
         
-        # Handle outliers using IQR method
-        numerical_cols = df.select_dtypes(include=[np.number]).columns
-        for col in numerical_cols:
-            if col not in ['dropout_risk', 'semester']:  # Don't process target and categorical
-                Q1 = df[col].quantile(0.25)
-                Q3 = df[col].quantile(0.75)
-                IQR = Q3 - Q1
-                lower_bound = Q1 - 1.5 * IQR
-                upper_bound = Q3 + 1.5 * IQR
-                
-                outliers_before = ((df[col] < lower_bound) | (df[col] > upper_bound)).sum()
-                df[col] = df[col].clip(lower_bound, upper_bound)
-                logger.info(f"Clipped {outliers_before} outliers in {col}")
+        # Handle outliers using IQR method, all columns in one pass over a
+        # column-major float block (compiled with Numba when available)
+        numerical_cols = [
+            col for col in self._classify(df)[0]
+            if col not in ['dropout_risk', 'semester']  # Don't process target and categorical
+        ]
+        if numerical_cols:
+            arr = np.asfortranarray(df[numerical_cols].to_numpy(dtype=np.float64))
+            outliers = _clip_iqr(arr)
+            df[numerical_cols] = arr
+            for col, count in zip(numerical_cols, outliers):
+                logger.info(f"Clipped {count} outliers in {col}")
         
         return df
     
@@ -155,15 +254,15 @@ class DataPreprocessor:
         logger.info("Handling missing values")
         
         # Separate numerical and categorical columns
-        numerical_cols = df.select_dtypes(include=[np.number]).columns
-        categorical_cols = df.select_dtypes(include=['object', 'category']).columns
+        numerical_cols, categorical_cols = self._classify(df)
         
-        # Handle numerical missing values
-        if len(numerical_cols) > 0:
-            df[numerical_cols] = self.numerical_imputer.fit_transform(df[numerical_cols])
+        # Handle numerical missing values on a float32 block
+        if numerical_cols:
+            values = df[numerical_cols].to_numpy(dtype=np.float32)
+            df[numerical_cols] = self.numerical_imputer.fit_transform(values)
         
         # Handle categorical missing values
-        if len(categorical_cols) > 0:
+        if categorical_cols:
             df[categorical_cols] = self.categorical_imputer.fit_transform(df[categorical_cols])
         
         logger.info(f"Handled missing values for {len(numerical_cols)} numerical and {len(categorical_cols)} categorical columns")
@@ -173,29 +272,48 @@ class DataPreprocessor:
         """Create new features from existing ones"""
         logger.info("Starting feature engineering")
         
+        # Pull the inputs out once and build every derived column as a plain
+        # array, then attach them in a single concat instead of one df[...] = per feature
+        attendance = df['overall_attendance_percentage'].to_numpy(dtype=np.float64)
+        cgpa = df['current_cgpa'].to_numpy(dtype=np.float64)
+        fee = df['fee_payment_percentage'].to_numpy(dtype=np.float64)
+        semester = df['semester'].to_numpy()
+        cgpa_gap = 10 - cgpa
+        
+        new_features = {}
+        
         # Academic performance ratios
-        df['gpa_to_attendance_ratio'] = df['current_cgpa'] / (df['overall_attendance_percentage'] + 1e-5)
-        df['performance_consistency'] = df['current_cgpa'] / (df['academic_consistency'] + 1e-5)
+        new_features['gpa_to_attendance_ratio'] = cgpa / (attendance + 1e-5)
+        new_features['performance_consistency'] = cgpa / (df['academic_consistency'].to_numpy(dtype=np.float64) + 1e-5)
         
         # Risk interaction features
-        df['attendance_academic_risk'] = (100 - df['overall_attendance_percentage']) * (10 - df['current_cgpa'])
-        df['financial_academic_risk'] = (100 - df['fee_payment_percentage']) * (10 - df['current_cgpa'])
+        new_features['attendance_academic_risk'] = (100 - attendance) * cgpa_gap
+        new_features['financial_academic_risk'] = (100 - fee) * cgpa_gap
         
         # Behavioral engagement score
-        df['engagement_score'] = (
-            df['mentor_meeting_frequency'] + 
-            df['library_usage'] + 
-            df['extracurricular_participation']
-        ) / 3
+        engagement = df['mentor_meeting_frequency'].to_numpy(dtype=np.float64, copy=True)
+        engagement += df['library_usage'].to_numpy(dtype=np.float64)
+        engagement += df['extracurricular_participation'].to_numpy(dtype=np.float64)
+        engagement /= 3
+        new_features['engagement_score'] = engagement
         
         # Time-based features
-        df['semester_progress'] = df['semester'] / 8.0  # Normalize to 0-1
-        df['critical_semester'] = (df['semester'].isin([3, 4, 7, 8])).astype(int)
+        new_features['semester_progress'] = semester / 8.0  # Normalize to 0-1
+        # Semesters outside the table, fractional or NaN map to index 0 (not critical)
+        semester_float = semester.astype(np.float64)
+        in_table = (
+            (semester_float >= 0) & (semester_float < len(CRITICAL_SEMESTER_LUT))
+            & (semester_float == np.floor(semester_float))
+        )
+        semester_index = np.where(in_table, semester_float, 0).astype(np.intp)
+        new_features['critical_semester'] = CRITICAL_SEMESTER_LUT[semester_index]
         
         # Log transforms for skewed features
         for col in DATA_CONFIG['feature_engineering']['log_transform']:
             if col in df.columns:
-                df[f'{col}_log'] = np.log1p(df[col])
+                new_features[f'{col}_log'] = np.log1p(df[col].to_numpy())
+        
+        df = pd.concat([df, pd.DataFrame(new_features, index=df.index)], axis=1)
         
         logger.info(f"Created {len(df.columns) - len(self.feature_columns)} new features")
         return df
@@ -250,14 +368,68 @@ class DataPreprocessor:
         
         return X_train_scaled, X_test_scaled, y_train, y_test
     
+    def _iter_chunks(self, file_path, chunk_rows: int):
+        """Yield a Parquet or CSV file as DataFrames of at most chunk_rows rows"""
+        if str(file_path).endswith('.parquet'):
+            for batch in pq.ParquetFile(file_path).iter_batches(batch_size=chunk_rows):
+                yield batch.to_pandas()
+        else:
+            yield from pd.read_csv(file_path, chunksize=chunk_rows)
+    
+    def prepare_data_streaming(self, input_path, output_path, chunk_rows: int = STREAMING_CHUNK_ROWS):
+        """
+        Scale a feature file that doesn't fit in memory, chunk by chunk
+        
+        The input must already be cleaned, imputed and feature-engineered
+        (outlier fences and medians need the whole column). One pass fits the
+        scaler with partial_fit, a second transforms each chunk and appends it
+        to a zstd Parquet file at output_path; peak memory is one chunk.
+        """
+        logger.info(f"Starting streaming data preparation for {input_path}")
+        
+        # Pass 1: accumulate mean/variance
+        self.scaler = StandardScaler()
+        n_rows = 0
+        for chunk in self._iter_chunks(input_path, chunk_rows):
+            if not self.feature_columns:
+                self.feature_columns = [
+                    col for col in chunk.columns if col not in (self.target_column, 'risk_score')
+                ]
+            self.scaler.partial_fit(chunk[self.feature_columns].to_numpy(dtype=np.float64))
+            n_rows += len(chunk)
+        
+        # Pass 2: scale and write
+        writer = None
+        try:
+            for chunk in self._iter_chunks(input_path, chunk_rows):
+                scaled = pd.DataFrame(
+                    self.scaler.transform(chunk[self.feature_columns].to_numpy(dtype=np.float64)),
+                    columns=self.feature_columns
+                )
+                if self.target_column in chunk.columns:
+                    scaled[self.target_column] = chunk[self.target_column].to_numpy()
+                
+                table = pa.Table.from_pandas(scaled, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(output_path, table.schema, compression=PARQUET_OPTIONS['compression'])
+                writer.write_table(table)
+        finally:
+            if writer is not None:
+                writer.close()
+        
+        logger.info(f"Streaming data preparation complete. Scaled {n_rows} rows into {output_path}")
+        return output_path
+    
     def save_preprocessors(self):
         """Save fitted preprocessors"""
-        joblib.dump(self.scaler, MODEL_PATHS['scaler'])
-        joblib.dump(self.numerical_imputer, MODELS_DIR / 'numerical_imputer.joblib')
-        joblib.dump(self.categorical_imputer, MODELS_DIR / 'categorical_imputer.joblib')
+        # Left uncompressed: joblib stores their fitted arrays inline, so
+        # load_preprocessors can memory-map them instead of copying
+        joblib.dump(self.scaler, get_model_path('scaler'), compress=0, protocol=JOBLIB_PROTOCOL)
+        joblib.dump(self.numerical_imputer, models_dir() / 'numerical_imputer.joblib', compress=0, protocol=JOBLIB_PROTOCOL)
+        joblib.dump(self.categorical_imputer, models_dir() / 'categorical_imputer.joblib', compress=0, protocol=JOBLIB_PROTOCOL)
         
         # Save feature columns
-        with open(MODELS_DIR / 'feature_columns.txt', 'w') as f:
+        with open(models_dir() / 'feature_columns.txt', 'w') as f:
             f.write('\n'.join(self.feature_columns))
         
         logger.info("Preprocessors saved successfully")
@@ -265,12 +437,13 @@ class DataPreprocessor:
     def load_preprocessors(self):
         """Load fitted preprocessors"""
         try:
-            self.scaler = joblib.load(MODEL_PATHS['scaler'])
-            self.numerical_imputer = joblib.load(MODELS_DIR / 'numerical_imputer.joblib')
-            self.categorical_imputer = joblib.load(MODELS_DIR / 'categorical_imputer.joblib')
+            # Read-only mmaps: worker processes share the pages instead of each holding a copy
+            self.scaler = joblib.load(get_model_path('scaler'), mmap_mode='r')
+            self.numerical_imputer = joblib.load(models_dir() / 'numerical_imputer.joblib', mmap_mode='r')
+            self.categorical_imputer = joblib.load(models_dir() / 'categorical_imputer.joblib', mmap_mode='r')
             
             # Load feature columns
-            with open(MODELS_DIR / 'feature_columns.txt', 'r') as f:
+            with open(models_dir() / 'feature_columns.txt', 'r') as f:
                 self.feature_columns = [line.strip() for line in f.readlines()]
             
             logger.info("Preprocessors loaded successfully")
@@ -285,8 +458,8 @@ def main():
     
     # Generate and save sample data
     df = preprocessor.generate_sample_data(n_samples=2000)
-    df.to_csv(DATA_PATHS['sample_data'], index=False)
-    logger.info(f"Sample data saved to {DATA_PATHS['sample_data']}")
+    df.to_parquet(get_data_path('sample_data'), **PARQUET_OPTIONS)
+    logger.info(f"Sample data saved to {get_data_path('sample_data')}")
     
     # Prepare data
     X_train, X_test, y_train, y_test = preprocessor.prepare_data(df)
@@ -297,11 +470,11 @@ def main():
     # Save processed data
     train_data = pd.DataFrame(X_train, columns=preprocessor.feature_columns)
     train_data['dropout_risk'] = y_train
-    train_data.to_csv(DATA_PATHS['training_data'], index=False)
+    train_data.to_parquet(get_data_path('training_data'), **PARQUET_OPTIONS)
     
     test_data = pd.DataFrame(X_test, columns=preprocessor.feature_columns)
     test_data['dropout_risk'] = y_test
-    test_data.to_csv(DATA_PATHS['test_data'], index=False)
+    test_data.to_parquet(get_data_path('test_data'), **PARQUET_OPTIONS)
     
     logger.info("Data preprocessing pipeline completed successfully")
 
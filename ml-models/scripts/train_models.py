@@ -3,11 +3,11 @@ Model training module for dropout prediction ML pipeline
 """
 import pandas as pd
 import numpy as np
-from sklearn.linear_model import LogisticRegression
+from sklearn.linear_model import LogisticRegression, LogisticRegressionCV
 from sklearn.tree import DecisionTreeClassifier
-from sklearn.ensemble import VotingClassifier
-from sklearn.model_selection import cross_val_score, GridSearchCV
-from sklearn.metrics import classification_report, confusion_matrix, roc_auc_score, roc_curve
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401 (enables HalvingGridSearchCV)
+from sklearn.model_selection import cross_val_score, HalvingGridSearchCV
+from sklearn.metrics import accuracy_score, classification_report, confusion_matrix, roc_auc_score, roc_curve
 import joblib
 import logging
 import matplotlib.pyplot as plt
@@ -16,6 +16,12 @@ from typing import Dict, Tuple, Any
 from data_preprocessing import DataPreprocessor
 from config import *
 
+try:
+    from lightgbm import LGBMClassifier
+    LIGHTGBM_AVAILABLE = True
+except ImportError:
+    LIGHTGBM_AVAILABLE = False
+
 # Set up logging
 logging.basicConfig(**LOGGING_CONFIG)
 logger = logging.getLogger(__name__)
@@ -28,10 +34,12 @@ class DropoutPredictor:
     
     def __init__(self):
         self.models = {}
-        self.ensemble_model = None
+        # The ensemble is a fixed weighted average of the member probabilities
+        self.ensemble_weights = PREDICTION_CONFIG['weights']
         self.preprocessor = DataPreprocessor()
         self.feature_importance = {}
         self.model_performance = {}
+        self.tuning_results = {}
         
     def initialize_models(self):
         """Initialize individual models with configured parameters"""
@@ -42,10 +50,21 @@ class DropoutPredictor:
             **MODEL_CONFIG['logistic_regression']['params']
         )
         
-        # Decision Tree
-        self.models['decision_tree'] = DecisionTreeClassifier(
-            **MODEL_CONFIG['decision_tree']['params']
-        )
+        # Decision Tree: a single histogram-binned LightGBM tree when available
+        # (learning_rate=1 so the one tree isn't shrunk), sklearn's otherwise
+        dt_params = MODEL_CONFIG['decision_tree']['params']
+        if LIGHTGBM_AVAILABLE:
+            self.models['decision_tree'] = LGBMClassifier(
+                n_estimators=1,
+                learning_rate=1.0,
+                max_depth=dt_params['max_depth'],
+                min_child_samples=dt_params['min_samples_leaf'],
+                random_state=dt_params['random_state'],
+                n_jobs=-1,
+                verbose=-1
+            )
+        else:
+            self.models['decision_tree'] = DecisionTreeClassifier(**dt_params)
         
         logger.info(f"Initialized {len(self.models)} models")
     
@@ -53,20 +72,25 @@ class DropoutPredictor:
         """Perform hyperparameter tuning for each model"""
         logger.info("Starting hyperparameter tuning")
         
-        # Logistic Regression parameter grid
+        # Logistic Regression parameter grid (searched as a warm-started C path)
         lr_param_grid = {
             'C': [0.001, 0.01, 0.1, 1, 10, 100],
-            'solver': ['liblinear', 'saga'],
             'penalty': ['l1', 'l2']
         }
         
         # Decision Tree parameter grid
-        dt_param_grid = {
-            'max_depth': [3, 5, 7, 10, None],
-            'min_samples_split': [2, 5, 10],
-            'min_samples_leaf': [1, 2, 4],
-            'criterion': ['gini', 'entropy']
-        }
+        if LIGHTGBM_AVAILABLE:
+            dt_param_grid = {
+                'num_leaves': [15, 31, 63],
+                'min_child_samples': [5, 20, 50]
+            }
+        else:
+            dt_param_grid = {
+                'max_depth': [3, 5, 7, 10, None],
+                'min_samples_split': [2, 5, 10],
+                'min_samples_leaf': [1, 2, 4],
+                'criterion': ['gini', 'entropy']
+            }
         
         param_grids = {
             'logistic_regression': lr_param_grid,
@@ -78,17 +102,48 @@ class DropoutPredictor:
         for model_name, model in self.models.items():
             logger.info(f"Tuning {model_name}")
             
-            grid_search = GridSearchCV(
+            if model_name == 'logistic_regression':
+                tuned_models[model_name], cv_scores, best_params = self._tune_logistic_regression(
+                    X_train, y_train, lr_param_grid
+                )
+                self.tuning_results[model_name] = {'cv_scores': cv_scores, 'n_samples': len(y_train)}
+                
+                logger.info(f"Best parameters for {model_name}: {best_params}")
+                logger.info(f"Best score for {model_name}: {cv_scores.mean():.4f}")
+                continue
+            
+            # Successive halving: every candidate starts on a small sample and
+            # only the best third moves on to 3x the data each round
+            grid_search = HalvingGridSearchCV(
                 model, 
                 param_grids[model_name],
+                factor=3,
+                resource='n_samples',
+                min_resources='exhaust',  # final round scores on (almost) all of X_train
                 cv=TRAINING_CONFIG['cv_folds'],
                 scoring=TRAINING_CONFIG['scoring_metric'],
+                error_score='raise',
+                random_state=TRAINING_CONFIG['random_state'],
                 n_jobs=-1,
-                verbose=1
+                verbose=0
             )
             
             grid_search.fit(X_train, y_train)
             tuned_models[model_name] = grid_search.best_estimator_
+            # Per-fold scores of the winner can stand in for a separate CV run
+            # only if it was scored in the final round. 'exhaust' floors
+            # min_resources, so that round can fall short of len(y_train) by
+            # less than factor ** (n_iterations - 1) samples; anything smaller
+            # means halving stopped on a real subsample
+            cv_results, best_index = grid_search.cv_results_, grid_search.best_index_
+            shortfall = len(y_train) - cv_results['n_resources'][best_index]
+            cv_scores = None
+            if shortfall < grid_search.factor ** (grid_search.n_iterations_ - 1):
+                cv_scores = np.array([
+                    cv_results[f'split{fold}_test_score'][best_index]
+                    for fold in range(TRAINING_CONFIG['cv_folds'])
+                ])
+            self.tuning_results[model_name] = {'cv_scores': cv_scores, 'n_samples': len(y_train)}
             
             logger.info(f"Best parameters for {model_name}: {grid_search.best_params_}")
             logger.info(f"Best score for {model_name}: {grid_search.best_score_:.4f}")
@@ -96,6 +151,38 @@ class DropoutPredictor:
         self.models = tuned_models
         return tuned_models
     
+    def _tune_logistic_regression(self, X_train: np.ndarray, y_train: np.ndarray, param_grid: Dict[str, list]):
+        """
+        Search C for each penalty along a regularization path
+        
+        LogisticRegressionCV fits the Cs of each fold in order, starting every
+        fit from the previous solution, instead of refitting each grid point
+        from zero. saga handles both l1 and l2. Returns the refit best model,
+        its per-fold scores and its parameters.
+        """
+        best = None
+        for penalty in param_grid['penalty']:
+            path = LogisticRegressionCV(
+                Cs=sorted(param_grid['C']),
+                penalty=penalty,
+                solver='saga',
+                tol=1e-3,
+                max_iter=MODEL_CONFIG['logistic_regression']['params']['max_iter'],
+                cv=TRAINING_CONFIG['cv_folds'],
+                scoring=TRAINING_CONFIG['scoring_metric'],
+                random_state=TRAINING_CONFIG['random_state'],
+                n_jobs=-1
+            )
+            path.fit(X_train, y_train)
+            
+            # (n_folds, n_Cs) scores for the positive class
+            fold_scores = path.scores_[path.classes_[1]]
+            best_c = fold_scores.mean(axis=0).argmax()
+            if best is None or fold_scores[:, best_c].mean() > best[1].mean():
+                best = (path, fold_scores[:, best_c], {'C': path.Cs_[best_c], 'penalty': penalty})
+        
+        return best
+    
     def train_individual_models(self, X_train: np.ndarray, y_train: np.ndarray):
         """Train individual models"""
         logger.info("Training individual models")
@@ -103,15 +190,17 @@ class DropoutPredictor:
         for model_name, model in self.models.items():
             logger.info(f"Training {model_name}")
             
-            # Train the model
-            model.fit(X_train, y_train)
-            
-            # Cross-validation score
-            cv_scores = cross_val_score(
-                model, X_train, y_train, 
-                cv=TRAINING_CONFIG['cv_folds'],
-                scoring=TRAINING_CONFIG['scoring_metric']
-            )
+            cv_scores = self._tuned_cv_scores(model_name, len(y_train))
+            if cv_scores is None:
+                # Train the model
+                model.fit(X_train, y_train)
+                
+                # Cross-validation score
+                cv_scores = cross_val_score(
+                    model, X_train, y_train, 
+                    cv=TRAINING_CONFIG['cv_folds'],
+                    scoring=TRAINING_CONFIG['scoring_metric']
+                )
             
             self.model_performance[model_name] = {
                 'cv_mean': cv_scores.mean(),
@@ -127,40 +216,20 @@ class DropoutPredictor:
             elif hasattr(model, 'coef_'):
                 self.feature_importance[model_name] = np.abs(model.coef_[0])
     
-    def create_ensemble(self):
-        """Create ensemble model using voting classifier"""
-        logger.info("Creating ensemble model")
-        
-        # Create weighted voting classifier
-        estimators = [(name, model) for name, model in self.models.items()]
-        
-        self.ensemble_model = VotingClassifier(
-            estimators=estimators,
-            voting='soft'  # Use probability voting
-        )
-        
-        logger.info("Ensemble model created")
+    def _tuned_cv_scores(self, model_name: str, n_samples: int):
+        """
+        Per-fold scores recorded while tuning, or None when the model still has
+        to be fitted and cross-validated (not tuned, tuned on other data, or
+        ranked on a subsample). Tuned models were already refit on X_train.
+        """
+        tuning = self.tuning_results.get(model_name)
+        if tuning is None or tuning['n_samples'] != n_samples:
+            return None
+        return tuning['cv_scores']
     
-    def train_ensemble(self, X_train: np.ndarray, y_train: np.ndarray):
-        """Train the ensemble model"""
-        logger.info("Training ensemble model")
-        
-        self.ensemble_model.fit(X_train, y_train)
-        
-        # Cross-validation for ensemble
-        cv_scores = cross_val_score(
-            self.ensemble_model, X_train, y_train,
-            cv=TRAINING_CONFIG['cv_folds'],
-            scoring=TRAINING_CONFIG['scoring_metric']
-        )
-        
-        self.model_performance['ensemble'] = {
-            'cv_mean': cv_scores.mean(),
-            'cv_std': cv_scores.std(),
-            'cv_scores': cv_scores
-        }
-        
-        logger.info(f"Ensemble CV Score: {cv_scores.mean():.4f} (+/- {cv_scores.std() * 2:.4f})")
+    def ensemble_proba(self, probabilities: Dict[str, Any]):
+        """Weighted average of the member probabilities (scalars or arrays)"""
+        return sum(weight * probabilities[name] for name, weight in self.ensemble_weights.items())
     
     def evaluate_models(self, X_test: np.ndarray, y_test: np.ndarray):
         """Evaluate all models on test set"""
@@ -169,12 +238,14 @@ class DropoutPredictor:
         evaluation_results = {}
         
         # Evaluate individual models
+        test_probabilities = {}
         for model_name, model in self.models.items():
-            y_pred = model.predict(X_test)
             y_pred_proba = model.predict_proba(X_test)[:, 1]
+            y_pred = (y_pred_proba > 0.5).astype(int)
+            test_probabilities[model_name] = y_pred_proba
             
             evaluation_results[model_name] = {
-                'accuracy': model.score(X_test, y_test),
+                'accuracy': accuracy_score(y_test, y_pred),
                 'roc_auc': roc_auc_score(y_test, y_pred_proba),
                 'classification_report': classification_report(y_test, y_pred),
                 'confusion_matrix': confusion_matrix(y_test, y_pred)
@@ -183,20 +254,19 @@ class DropoutPredictor:
             logger.info(f"{model_name} Test Accuracy: {evaluation_results[model_name]['accuracy']:.4f}")
             logger.info(f"{model_name} Test ROC-AUC: {evaluation_results[model_name]['roc_auc']:.4f}")
         
-        # Evaluate ensemble model
-        if self.ensemble_model:
-            y_pred_ensemble = self.ensemble_model.predict(X_test)
-            y_pred_proba_ensemble = self.ensemble_model.predict_proba(X_test)[:, 1]
-            
-            evaluation_results['ensemble'] = {
-                'accuracy': self.ensemble_model.score(X_test, y_test),
-                'roc_auc': roc_auc_score(y_test, y_pred_proba_ensemble),
-                'classification_report': classification_report(y_test, y_pred_ensemble),
-                'confusion_matrix': confusion_matrix(y_test, y_pred_ensemble)
-            }
-            
-            logger.info(f"Ensemble Test Accuracy: {evaluation_results['ensemble']['accuracy']:.4f}")
-            logger.info(f"Ensemble Test ROC-AUC: {evaluation_results['ensemble']['roc_auc']:.4f}")
+        # Evaluate ensemble from the member probabilities already computed
+        y_pred_proba_ensemble = self.ensemble_proba(test_probabilities)
+        y_pred_ensemble = (y_pred_proba_ensemble > 0.5).astype(int)
+        
+        evaluation_results['ensemble'] = {
+            'accuracy': accuracy_score(y_test, y_pred_ensemble),
+            'roc_auc': roc_auc_score(y_test, y_pred_proba_ensemble),
+            'classification_report': classification_report(y_test, y_pred_ensemble),
+            'confusion_matrix': confusion_matrix(y_test, y_pred_ensemble)
+        }
+        
+        logger.info(f"Ensemble Test Accuracy: {evaluation_results['ensemble']['accuracy']:.4f}")
+        logger.info(f"Ensemble Test ROC-AUC: {evaluation_results['ensemble']['roc_auc']:.4f}")
         
         return evaluation_results
     
@@ -210,49 +280,41 @@ class DropoutPredictor:
         Returns:
             Dictionary with risk score, category, and individual model predictions
         """
-        # Convert to DataFrame for preprocessing
-        df = pd.DataFrame([student_data])
+        # One float row in training column order; skips the DataFrame and
+        # per-call dtype inference that dominate size-1 predictions
+        feature_columns = self.preprocessor.feature_columns
+        x = np.fromiter(
+            (student_data[col] for col in feature_columns),
+            dtype=np.float64,
+            count=len(feature_columns)
+        ).reshape(1, -1)
         
         # Preprocess the data
         # Note: In production, you'd need to handle this more carefully
         # to ensure consistent feature engineering
         
-        # Get predictions from individual models
+        # Get predictions from individual models: one predict_proba each, with
+        # the label derived from it the way predict() would (argmax, ties -> 0)
         predictions = {}
         probabilities = {}
         
         for model_name, model in self.models.items():
-            pred = model.predict(df)[0]
-            pred_proba = model.predict_proba(df)[0, 1]
+            pred_proba = model.predict_proba(x)[0, 1]
             
-            predictions[model_name] = pred
+            predictions[model_name] = int(pred_proba > 0.5)
             probabilities[model_name] = pred_proba
         
         # Get ensemble prediction
-        if self.ensemble_model:
-            ensemble_pred = self.ensemble_model.predict(df)[0]
-            ensemble_proba = self.ensemble_model.predict_proba(df)[0, 1]
-            
-            predictions['ensemble'] = ensemble_pred
-            probabilities['ensemble'] = ensemble_proba
-        
-        # Calculate weighted risk score
-        weights = PREDICTION_CONFIG['weights']
-        weighted_score = (
-            probabilities['logistic_regression'] * weights['logistic_regression'] +
-            probabilities['decision_tree'] * weights['decision_tree']
-        )
+        ensemble_proba = float(self.ensemble_proba(probabilities))
         
-        # Convert to 0-100 scale
-        risk_score = weighted_score * 100
+        predictions['ensemble'] = int(ensemble_proba > 0.5)
+        probabilities['ensemble'] = ensemble_proba
+        
+        # Convert the weighted ensemble probability to a 0-100 risk score
+        risk_score = ensemble_proba * 100
         
         # Determine risk category
-        if risk_score <= PREDICTION_CONFIG['risk_categories']['low'][1]:
-            risk_category = 'low'
-        elif risk_score <= PREDICTION_CONFIG['risk_categories']['medium'][1]:
-            risk_category = 'medium'
-        else:
-            risk_category = 'high'
+        risk_category = str(RISK_LABELS[np.digitize(risk_score, RISK_BINS, right=True)])
         
         return {
             'risk_score': risk_score,
@@ -268,23 +330,17 @@ class DropoutPredictor:
         
         # Save individual models
         for model_name, model in self.models.items():
-            model_path = MODEL_PATHS[model_name]
-            joblib.dump(model, model_path)
+            model_path = get_model_path(model_name)
+            joblib.dump(model, model_path, compress=JOBLIB_COMPRESS, protocol=JOBLIB_PROTOCOL)
             logger.info(f"Saved {model_name} to {model_path}")
         
-        # Save ensemble model
-        if self.ensemble_model:
-            ensemble_path = MODELS_DIR / 'ensemble_model.joblib'
-            joblib.dump(self.ensemble_model, ensemble_path)
-            logger.info(f"Saved ensemble model to {ensemble_path}")
-        
         # Save feature importance
-        importance_path = MODELS_DIR / 'feature_importance.joblib'
-        joblib.dump(self.feature_importance, importance_path)
+        importance_path = models_dir() / 'feature_importance.joblib'
+        joblib.dump(self.feature_importance, importance_path, compress=JOBLIB_COMPRESS, protocol=JOBLIB_PROTOCOL)
         
         # Save model performance
-        performance_path = MODELS_DIR / 'model_performance.joblib'
-        joblib.dump(self.model_performance, performance_path)
+        performance_path = models_dir() / 'model_performance.joblib'
+        joblib.dump(self.model_performance, performance_path, compress=JOBLIB_COMPRESS, protocol=JOBLIB_PROTOCOL)
         
         logger.info("All models saved successfully")
     
@@ -295,23 +351,17 @@ class DropoutPredictor:
         try:
             # Load individual models
             for model_name in MODEL_CONFIG.keys():
-                model_path = MODEL_PATHS[model_name]
+                model_path = get_model_path(model_name)
                 self.models[model_name] = joblib.load(model_path)
                 logger.info(f"Loaded {model_name} from {model_path}")
             
-            # Load ensemble model
-            ensemble_path = MODELS_DIR / 'ensemble_model.joblib'
-            if ensemble_path.exists():
-                self.ensemble_model = joblib.load(ensemble_path)
-                logger.info(f"Loaded ensemble model from {ensemble_path}")
-            
             # Load feature importance
-            importance_path = MODELS_DIR / 'feature_importance.joblib'
+            importance_path = models_dir() / 'feature_importance.joblib'
             if importance_path.exists():
                 self.feature_importance = joblib.load(importance_path)
             
             # Load model performance
-            performance_path = MODELS_DIR / 'model_performance.joblib'
+            performance_path = models_dir() / 'model_performance.joblib'
             if performance_path.exists():
                 self.model_performance = joblib.load(performance_path)
             
@@ -334,8 +384,10 @@ class DropoutPredictor:
             axes = [axes]
         
         for idx, (model_name, importance) in enumerate(self.feature_importance.items()):
-            # Get top 10 features
-            top_indices = np.argsort(importance)[-10:]
+            # Get top 10 features: O(n) selection, then order just those
+            k = min(10, len(importance))
+            top_indices = np.argpartition(importance, -k)[-k:]
+            top_indices = top_indices[np.argsort(importance[top_indices])]
             top_features = [feature_names[i] for i in top_indices]
             top_importance = importance[top_indices]
             
@@ -346,8 +398,9 @@ class DropoutPredictor:
             axes[idx].set_xlabel('Importance')
         
         plt.tight_layout()
-        plt.savefig(MODELS_DIR / 'feature_importance.png', dpi=300, bbox_inches='tight')
+        plt.savefig(models_dir() / 'feature_importance.png', dpi=300, bbox_inches='tight')
         plt.show()
+        plt.close(fig)
     
     def full_training_pipeline(self, data_path: str = None):
         """Complete training pipeline"""
@@ -366,10 +419,6 @@ class DropoutPredictor:
         # Train individual models
         self.train_individual_models(X_train, y_train)
         
-        # Create and train ensemble
-        self.create_ensemble()
-        self.train_ensemble(X_train, y_train)
-        
         # Evaluate models
         evaluation_results = self.evaluate_models(X_test, y_test)
         